@@ -1,36 +1,138 @@
 import discord
 from discord.ext import commands
-from discord import FFmpegPCMAudio, app_commands
+from discord import FFmpegPCMAudio, FFmpegOpusAudio, app_commands
 from discord.ui import Button, View
 import aiohttp
+from aiohttp import web
 import asyncio
 import os
+import json
+import base64
 import time
+import random
 import re
+import signal
+import stat
 import subprocess
 import tempfile
-import socket
+import struct
+import hashlib
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+import sys
+import threading
 import traceback
-from mutagen.oggvorbis import OggVorbis
-from urllib.request import urlopen
-from urllib.error import URLError, HTTPError
-from tempfile import NamedTemporaryFile
+import types
+import weakref
+import yarl
+try:
+    import fcntl
+except ImportError:  # Windows: single process only, no shared-file locking
+    fcntl = None
+from array import array
+from collections import OrderedDict, deque
 
 # === GLOBAL STATE ===
-manifest_data = []
-voice_clients = {}
-playback_index = {}
-playback_contexts = {}
-active_verse_tasks = {}
+manifest_snapshot = None  # ManifestSnapshot being served; replaced whole on reload, never edited
+manifest_refresh_task = None
+reaper_task = None
+plan_task = None
+sessions = {}  # All playback state for a voice channel lives on its session
+# Format: {vcid: PlaybackSession}
 last_panel_message = {}
-pause_state = {}  # Track pause timing for each voice client
-# Format: {vcid: {'total_pause_time': float, 'pause_start_time': float | None}}
-playback_queue = {}  # Queue chapters for each voice client
-# Format: {vcid: [chapter_index1, chapter_index2, ...]}
-verse_range_playback = {}  # Track verse range playback
-# Format: {vcid: {'start_verse': int, 'end_verse': int, 'stop_after': bool}}
+# Format: {text_channel_id: discord.Message}
+ffmpeg_sources = weakref.WeakSet()  # Every source we've built; a live one owns its FFmpeg child
+active_temp_files = set()  # .part / .tmp paths this process is writing right now
+reading_plans = {}  # Daily reading plans, at most one per voice channel
+# Format: {voice channel id: ReadingPlan}
+plan_tasks = set()  # Ramp-ups in progress
+plans_save_lock = asyncio.Lock()  # Serialises this process's reading plan saves
+plan_stats = {'started': 0, 'skipped': 0, 'connect_failures': 0}
+reaper_stats = {'passes': 0, 'voice': 0, 'sessions': 0, 'ffmpeg': 0, 'temp_files': 0, 'temp_bytes': 0, 'panels': 0, 'last': None}
+duration_cache = {}  # Chapter audio lengths learned from probes
+# Format: {url: seconds}
+duration_probes = {}  # In-flight duration probes, so concurrent plays share one
+# Format: {url: asyncio.Task}
+broadcasts = {}  # One decoder per distinct audio, fanned out to every subscribed channel
+# Format: {(url, seek_time, end_time): Broadcast}
+transition_stats = {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0}  # Seconds from EOS to next vc.play
 
 MANIFEST_URL = "https://pub-9ced34a9f0ea4ebd9d5c6fe77774b23e.r2.dev/manifest.json"
+# Last good manifest on local disk, so the bot starts with working data even if R2 is down
+MANIFEST_CACHE_PATH = os.getenv("MANIFEST_CACHE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "manifest_cache.json"))
+MANIFEST_META_PATH = MANIFEST_CACHE_PATH + ".meta"
+MANIFEST_REFRESH_MINUTES = float(os.getenv("MANIFEST_REFRESH_MINUTES", "30"))  # 0 disables the background refresh
+
+DEFAULT_DURATION = 60.0  # Used when a chapter's length can't be determined
+OGG_HEAD_PROBE_BYTES = 4096    # First page(s) hold the codec identification header
+OGG_TAIL_PROBE_BYTES = 65536   # Comfortably more than one Ogg page (max ~64KB)
+
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", os.path.join(tempfile.gettempdir(), "bible-audio-cache"))
+AUDIO_CACHE_MAX_MB = int(os.getenv("AUDIO_CACHE_MAX_MB", "2048"))  # 0 disables the cache
+AUDIO_CACHE_CHUNK = 64 * 1024
+
+CLIP_CACHE_MB = int(os.getenv("CLIP_CACHE_MB", "64"))  # In-memory Opus clips of hot verse ranges; 0 disables
+CLIP_ADMIT_REQUESTS = 2     # Requests before a range is worth recording
+CLIP_DECAY_LOOKUPS = 1000   # Request counts are halved this often
+CLIP_PACKET_OVERHEAD = 33   # sys.getsizeof(b'') - what a bytes object costs beyond its data
+CLIP_LENGTH_TOLERANCE = 0.5  # Seconds a recording may differ from its range's length and still be kept
+
+SEEK_INDEX_DIR = os.getenv("SEEK_INDEX_DIR", AUDIO_CACHE_DIR.rstrip(os.sep) + "-seek")  # Beside the cache, not in it
+SEEK_INDEX_STEP_SECONDS = 1        # Spacing of index entries; the span FFmpeg decodes and throws away
+SEEK_INDEX_MAX_HEADER = 64 * 1024  # Header pages resent with every ranged read; bigger files aren't indexed
+SEEK_INDEX_MEMORY_ENTRIES = 256    # Indexes kept in memory (the rest are re-read from disk)
+SEEK_PREROLL_SECONDS = 0.1         # Minimum audio decoded before the seek point
+
+# "opus": FFmpeg hands finished Opus packets straight to the voice socket (no PCM round trip
+#         or Python-side encoding). Manifest entries with an "opus_url" (pre-transcoded
+#         Ogg/Opus) are stream-copied without any decoding at all.
+# "pcm":  FFmpeg decodes to PCM and discord.py encodes every frame (the original behaviour).
+PLAYBACK_MODE = os.getenv("PLAYBACK_MODE", "opus").lower()
+OPUS_BITRATE = int(os.getenv("OPUS_BITRATE", "128"))  # kbps, only used when FFmpeg encodes
+TAIL_PAD_SECONDS = 2  # Matches apad=pad_dur=2 so the last verse isn't clipped
+FRAME_SECONDS = 0.02  # discord.py sends one 20 ms frame per read()
+OPUS_SILENCE_FRAME = b'\xf8\xff\xfe'
+
+PREFETCH_LEAD_SECONDS = float(os.getenv("PREFETCH_LEAD_SECONDS", "20"))  # Start warming this long before the end
+PREFETCH_BUFFER_FRAMES = 150  # 3 s of 20 ms frames decoded ahead of the transition
+
+VERSE_LEAD_DEFAULT = 0.5  # Seconds, until a session has measured its own edits
+VERSE_LEAD_MIN = -1.0     # Negative: audio reaches listeners later than edits do
+VERSE_LEAD_MAX = 3.0
+VOICE_JITTER_BUFFER_SECONDS = 0.06  # Roughly what Discord clients buffer before playing voice
+
+BROADCAST_BUFFER_SECONDS = 10  # Opus packets kept for subscribers that fall behind (pauses, slow threads)
+BROADCAST_JOIN_BACKLOG_SECONDS = 1.0  # A new subscriber starts this far behind live, so near-simultaneous joins hear the start
+
+# Sharding: leave SHARD_COUNT unset for a single connection. supervisor.py sets both per worker.
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0"))
+SHARD_IDS = os.getenv("SHARD_IDS", "")  # Shards this process owns, e.g. "0-3" or "0,2"; empty = all
+# Point both at fake_gateway.py for local testing
+DISCORD_API_BASE = os.getenv("DISCORD_API_BASE")
+DISCORD_GATEWAY_URL = os.getenv("DISCORD_GATEWAY_URL")
+
+REAPER_INTERVAL_SECONDS = 60
+VOICE_IDLE_TIMEOUT = float(os.getenv("VOICE_IDLE_TIMEOUT", "300"))  # Connected but not playing (paused counts)
+VOICE_EMPTY_TIMEOUT = float(os.getenv("VOICE_EMPTY_TIMEOUT", "60"))  # No one but bots left in the channel
+STALE_TEMP_SECONDS = 3600  # A partial file nobody has written to for this long is abandoned
+PANEL_REF_MAX_AGE = 24 * 3600  # Older panels are left in chat rather than replaced
+
+READING_PLANS_PATH = os.getenv("READING_PLANS_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "reading_plans.json"))
+PLAN_RAMP_SECONDS = float(os.getenv("PLAN_RAMP_SECONDS", "120"))  # Voice connects spread over this window before a start
+PLAN_MAX_CONNECTING = 4        # Voice handshakes in flight at once during a ramp
+PLAN_LATE_GRACE_SECONDS = 1800  # A start missed (e.g. by a restart) still happens if it's at most this late
+PLAN_CHECK_SECONDS = 20
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # Prometheus endpoint at /metrics; 0 disables
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_LAG_INTERVAL = 0.5  # Seconds between event loop lag samples
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "32"))  # Open connections across all hosts
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "8"))  # Everything we fetch lives on one R2 host
+HTTP_KEEPALIVE_SECONDS = 60
+HTTP_DNS_TTL_SECONDS = 300
+HTTP_TIMEOUT_SECONDS = 30  # Default total timeout; callers pass their own where it differs
 
 # === VERSE RANGE PARSING ===
 def parse_verse_reference(verse_ref):
@@ -73,57 +175,680 @@ def parse_verse_reference(verse_ref):
     
     return min_verse, max_verse, sorted(list(specific_verses))
 
-def get_verse_start_time(timestamps, target_verse):
-    """Get the start time for a specific verse from timestamps"""
-    if not timestamps or not isinstance(timestamps, list):
-        print("⚠️ Invalid timestamps array")
+def get_verse_start_time(chapter, target_verse):
+    """Get the start time for a specific verse of a Chapter"""
+    if not len(chapter):
+        print("⚠️ Chapter has no timestamps")
         return 0.0
     
-    for timestamp in timestamps:
-        if not isinstance(timestamp, dict):
-            continue
-        if timestamp.get('verse') == target_verse:
-            return float(timestamp.get('start', 0.0))
+    i = chapter.position_of(target_verse)
+    if i is not None:
+        return chapter.starts[i]
     
     print(f"⚠️ Verse {target_verse} not found in timestamps")
     return 0.0
 
-def get_verse_end_time(timestamps, target_verse):
-    """Get the end time for a specific verse from timestamps"""
-    if not timestamps or not isinstance(timestamps, list):
-        print("⚠️ Invalid timestamps array")
+def get_verse_end_time(chapter, target_verse):
+    """Get the end time for a specific verse of a Chapter"""
+    if not len(chapter):
+        print("⚠️ Chapter has no timestamps")
         return None
     
-    for i, timestamp in enumerate(timestamps):
-        if not isinstance(timestamp, dict):
-            continue
-        if timestamp.get('verse') == target_verse:
-            # If this is the last verse, use the chapter duration
-            if i + 1 < len(timestamps):
-                next_start = timestamps[i + 1].get('start')
-                if next_start is not None:
-                    return float(next_start)
-            # Estimate end time based on verse duration
-            return float(timestamp.get('start', 0.0)) + 30.0  # Assume ~30 seconds per verse max
+    i = chapter.position_of(target_verse)
+    if i is not None:
+        # Run up to the next verse so the pause between verses isn't clipped
+        if i + 1 < len(chapter):
+            return chapter.starts[i + 1]
+        # Estimate end time based on verse duration
+        return chapter.starts[i] + 30.0  # Assume ~30 seconds per verse max
     
     print(f"⚠️ Verse {target_verse} not found in timestamps")
     return None
 
+# === COMPACT MANIFEST ===
+def clean_verse_text(raw):
+    return re.sub(r'^\d+\.\s*', '', raw.strip())
+
+class VerseTextStore:
+    """Every verse's text in one shared UTF-8 buffer, addressed by offsets"""
+    __slots__ = ('buffer', 'offsets')
+
+    def __init__(self, chunks):
+        offsets = array('I', [0])
+        pos = 0
+        for chunk in chunks:
+            pos += len(chunk)
+            offsets.append(pos)
+        self.buffer = b''.join(chunks)
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def get(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+class Chapter:
+    """
+    One manifest entry. Verse numbers and times live in typed arrays and the verse text
+    in the shared VerseTextStore, instead of a dict per verse. Verses are kept in start-time
+    order, so time lookups bisect `starts` and verse lookups bisect (or index) `verses`.
+    """
+    __slots__ = ('book', 'chapter', 'url', 'opus_url', 'duration',
+                 'verses', 'starts', 'ends', 'store', 'text_base', 'verse_base', 'verses_sorted')
+
+    def __init__(self, book, chapter, url, opus_url, duration, verses, starts, ends, store, text_base):
+        self.book = book
+        self.chapter = chapter
+        self.url = url
+        self.opus_url = opus_url
+        self.duration = duration    # Seconds, or None if the manifest doesn't say
+        self.verses = verses        # array('H') of verse numbers, in playback order
+        self.starts = starts        # array('d') of start times
+        self.ends = ends            # array('d') of end times (NaN where the manifest has none)
+        self.store = store
+        self.text_base = text_base  # Index of this chapter's first verse in store
+        n = len(verses)
+        self.verses_sorted = all(verses[i] < verses[i + 1] for i in range(n - 1))
+        # Contiguous numbering (the normal case) makes verse -> position plain arithmetic
+        contiguous = self.verses_sorted and n and verses[-1] - verses[0] == n - 1
+        self.verse_base = verses[0] if contiguous else None
+
+    def __len__(self):
+        return len(self.verses)
+
+    @property
+    def label(self):
+        return f"{self.book} {self.chapter}"
+
+    def text(self, i):
+        return self.store.get(self.text_base + i)
+
+    def signature(self):
+        """Everything a listener could notice, for spotting changed chapters across reloads"""
+        store = self.store
+        n = len(self.verses)
+        text = store.buffer[store.offsets[self.text_base]:store.offsets[self.text_base + n]]
+        return (self.url, self.opus_url, self.duration, self.verses.tobytes(),
+                self.starts.tobytes(), self.ends.tobytes(), text)
+
+    def position_of(self, verse):
+        """Position of a verse number in this chapter, or None"""
+        verses = self.verses
+        if self.verse_base is not None:
+            i = verse - self.verse_base
+            return i if 0 <= i < len(verses) else None
+        if self.verses_sorted:
+            i = bisect_left(verses, verse)
+            return i if i < len(verses) and verses[i] == verse else None
+        for i, v in enumerate(verses):
+            if v == verse:
+                return i
+        return None
+
+    def position_at(self, t):
+        """Position of the verse playing at chapter time t (-1 before the first verse)"""
+        return bisect_right(self.starts, t) - 1
+
+    def view(self, start_verse=None, end_verse=None, offset=0.0):
+        """Read-only VerseRangeView of verses start_verse..end_verse (inclusive), no copying"""
+        n = len(self.verses)
+        if not self.verses_sorted:
+            lo = 0
+            while lo < n and self.verses[lo] < (start_verse or 0):
+                lo += 1
+            hi = lo
+            while hi < n and (end_verse is None or self.verses[hi] <= end_verse):
+                hi += 1
+        else:
+            lo = 0 if start_verse is None else bisect_left(self.verses, start_verse)
+            hi = n if end_verse is None else bisect_right(self.verses, end_verse)
+        return VerseRangeView(self, lo, max(lo, hi), offset)
+
+class VerseRangeView:
+    """
+    Window onto verse positions [lo, hi) of a Chapter. Times come back shifted by
+    -offset; nothing is copied and the Chapter is never written to.
+    """
+    __slots__ = ('chapter', 'lo', 'hi', 'offset')
+
+    def __init__(self, chapter, lo, hi, offset=0.0):
+        self.chapter = chapter
+        self.lo = lo
+        self.hi = hi
+        self.offset = offset
+
+    def __len__(self):
+        return self.hi - self.lo
+
+    def __getitem__(self, i):
+        """(verse, start, end, text) for the i-th verse in the view"""
+        if i < 0:
+            i += self.hi - self.lo
+        if not 0 <= i < self.hi - self.lo:
+            raise IndexError("verse view index out of range")
+        return (self.verse(i), self.start(i), self.end(i), self.text(i))
+
+    def __iter__(self):
+        for i in range(self.hi - self.lo):
+            yield self[i]
+
+    @property
+    def label(self):
+        return self.chapter.label
+
+    def verse(self, i):
+        return self.chapter.verses[self.lo + i]
+
+    def start(self, i):
+        return self.chapter.starts[self.lo + i] - self.offset
+
+    def end(self, i):
+        return self.chapter.ends[self.lo + i] - self.offset
+
+    def text(self, i):
+        return self.chapter.text(self.lo + i)
+
+    def index_at(self, t):
+        """Index of the verse playing at view time t (-1 before the first one)"""
+        return bisect_right(self.chapter.starts, t + self.offset, self.lo, self.hi) - 1 - self.lo
+
+def compact_manifest(manifest):
+    """Convert the parsed manifest JSON (list of dicts) into [Chapter] sharing one text buffer"""
+    chapters = []
+    chunks = []
+    for entry in manifest:
+        text_base = len(chunks)
+        verses = array('H')
+        starts = array('d')
+        ends = array('d')
+        # Playback order; bisecting starts relies on it
+        timestamps = sorted(entry.get("timestamps") or (), key=lambda t: float(t['start']))
+        for t in timestamps:
+            verses.append(int(t['verse']))
+            starts.append(float(t['start']))
+            end = t.get('end')
+            ends.append(float(end) if end is not None else math.nan)
+            chunks.append(clean_verse_text(t.get('text', '')).encode('utf-8'))
+        duration = entry.get("duration")
+        chapters.append(Chapter(
+            sys.intern(entry['book']),
+            int(entry['chapter']),
+            entry['url'],
+            entry.get('opus_url'),
+            float(duration) if duration else None,
+            verses, starts, ends, None, text_base,
+        ))
+    store = VerseTextStore(chunks)
+    for chapter in chapters:
+        chapter.store = store
+    return chapters
+
 intents = discord.Intents.default()
 intents.message_content = True
 intents.voice_states = True
 intents.guilds = True
 
-bot = commands.Bot(command_prefix="!", intents=intents)
+# Lets live_editors see Discord's per-route rate-limit headers on message edits
+http_trace = aiohttp.TraceConfig()
+
+def parse_shard_ids(text):
+    """'0-3' / '0,2,5' / '' -> list of shard ids, or None for all of them"""
+    ids = []
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            ids.extend(range(int(first), int(last) + 1))
+        else:
+            ids.append(int(part))
+    return ids or None
+
+if DISCORD_API_BASE:
+    discord.http.Route.BASE = DISCORD_API_BASE.rstrip('/')
+if DISCORD_GATEWAY_URL:
+    # Used as-is when the shard count is fixed; unsharded logins ask /gateway/bot instead
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(DISCORD_GATEWAY_URL)
+
+shard_ids = parse_shard_ids(SHARD_IDS) if SHARD_COUNT else None
+# Each sharded process keeps its own playback state and manifest snapshot; nothing is shared
+# between processes except the on-disk audio cache and manifest snapshot files.
+BotBase = commands.AutoShardedBot if SHARD_COUNT else commands.Bot
+
+class BibleBot(BotBase):
+    async def setup_hook(self):
+        # Panel components are matched by custom_id, so panels posted before a restart keep working
+        self.add_dynamic_items(PanelSelect, PanelButton)
+
+    async def close(self):
+        await http_client.close()
+        await super().close()
+
+if SHARD_COUNT:
+    bot = BibleBot(command_prefix="!", intents=intents, http_trace=http_trace,
+                   shard_count=SHARD_COUNT, shard_ids=shard_ids)
+else:
+    bot = BibleBot(command_prefix="!", intents=intents, http_trace=http_trace)
+
+# === HTTP CLIENT ===
+class HttpClient:
+    """
+    One pooled aiohttp session for all of our own HTTP (manifest, duration probes, cache
+    fills), so requests to R2 reuse kept-alive TLS connections instead of handshaking
+    every time. The session is created on first use, inside the running loop.
+    """
+    def __init__(self, limit, limit_per_host):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = None
+        self.requests = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.dns_lookups = 0
+        self.dns_cache_hits = 0
+
+    def _trace_config(self):
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.requests += 1
+
+        async def on_request_exception(session, ctx, params):
+            self.errors += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.connections_created += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.connections_reused += 1
+
+        async def on_dns_resolvehost_end(session, ctx, params):
+            self.dns_lookups += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self.dns_cache_hits += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        return trace
+
+    @property
+    def session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=HTTP_DNS_TTL_SECONDS,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS),
+                trace_configs=[self._trace_config()],
+            )
+        return self._session
+
+    def get(self, url, timeout=None, **kwargs):
+        """session.get with an optional total timeout in seconds; use as `async with`"""
+        if timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        return self.session.get(url, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self):
+        connector = self._session.connector if self._session and not self._session.closed else None
+        idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values()) if connector else 0
+        in_use = len(getattr(connector, '_acquired', ())) if connector else 0
+        total = self.connections_created + self.connections_reused
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'created': self.connections_created,
+            'reused': self.connections_reused,
+            'reuse_rate': self.connections_reused / total if total else 0.0,
+            'dns_lookups': self.dns_lookups,
+            'dns_cache_hits': self.dns_cache_hits,
+            'idle': idle,
+            'in_use': in_use,
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+        }
+
+http_client = HttpClient(HTTP_POOL_LIMIT, HTTP_POOL_PER_HOST)
+
+# === TEMP FILES ===
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, just not ours
+    return True
+
+def is_stale_temp_file(path):
+    """
+    A `<name>.<pid>.part|tmp` file is abandoned if this process isn't writing it, its
+    writer has exited, or it hasn't been touched in STALE_TEMP_SECONDS (pid reuse).
+    Other live processes sharing the directory keep their in-progress files.
+    """
+    if path in active_temp_files:
+        return False
+    try:
+        pid = int(path.rsplit('.', 2)[-2])
+    except (ValueError, IndexError):
+        pid = None
+    if pid == os.getpid() or (pid is not None and not pid_alive(pid)):
+        return True
+    try:
+        return time.time() - os.path.getmtime(path) > STALE_TEMP_SECONDS
+    except OSError:
+        return False
+
+def remove_stale_temp_files(paths):
+    """Delete the stale ones among paths; returns (files, bytes) removed"""
+    files = size = 0
+    for path in paths:
+        if not is_stale_temp_file(path):
+            continue
+        try:
+            file_size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            continue
+        files += 1
+        size += file_size
+    return files, size
+
+# === AUDIO CACHE ===
+class AudioCache:
+    """
+    Shared on-disk LRU cache of chapter audio, keyed by manifest URL.
+    The first play of a chapter streams from R2 while a background fill downloads it;
+    later plays in any voice channel read the local file instead.
+    """
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # {filename: size}, least recently used first
+        self.total_bytes = 0
+        self.filling = {}  # {url: asyncio.Task}
+        self.hits = 0
+        self.misses = 0
+        self.fills = 0
+        self.fill_errors = 0
+        self.evictions = 0
+        if self.enabled:
+            self._load()
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _filename(self, url):
+        ext = os.path.splitext(url.split('?', 1)[0])[1] or '.ogg'
+        return hashlib.sha1(url.encode('utf-8')).hexdigest() + ext
+
+    def _load(self):
+        """Rebuild the LRU order from files left by a previous run (oldest access first)"""
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        self.sweep_partials()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith('.part'):
+                continue  # Fill in progress in another process, see sweep_partials
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue  # e.g. a directory someone put here; eviction would try to os.remove() it
+            found.append((st.st_mtime, name, st.st_size))
+        for _, name, size in sorted(found):
+            self.entries[name] = size
+            self.total_bytes += size
+        self._evict()
+        if self.entries:
+            print(f"💾 Audio cache: {len(self.entries)} file(s), {self.total_bytes / 1048576:.1f} MB")
+
+    def sweep_partials(self):
+        """Remove abandoned .part files (interrupted fills). Returns (files, bytes) removed."""
+        if not self.enabled:
+            return 0, 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0, 0
+        return remove_stale_temp_files(os.path.join(self.directory, name)
+                                       for name in names if name.endswith('.part'))
+
+    def lookup(self, url):
+        """Return the local path for url if cached, otherwise None (and start a fill)"""
+        if not self.enabled:
+            return None
+        name = self._filename(url)
+        if name in self.entries:
+            path = os.path.join(self.directory, name)
+            if os.path.exists(path):
+                self.hits += 1
+                self.entries.move_to_end(name)
+                try:
+                    os.utime(path)  # Keep LRU order across restarts
+                except OSError:
+                    pass
+                return path
+            # File was removed behind our back
+            self.total_bytes -= self.entries.pop(name)
+        else:
+            # Another worker process sharing the directory may have filled it
+            path = os.path.join(self.directory, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                size = None
+            if size is not None:
+                self.entries[name] = size
+                self.total_bytes += size
+                self.hits += 1
+                self._evict()
+                return path
+        self.misses += 1
+        self.fill(url)
+        return None
+
+    def peek(self, url):
+        """Return the local path for url if cached, without touching counters or LRU order"""
+        if not self.enabled:
+            return None
+        name = self._filename(url)
+        return os.path.join(self.directory, name) if name in self.entries else None
+
+    def fill(self, url):
+        if not self.enabled or url in self.filling or self._filename(url) in self.entries:
+            return
+        task = asyncio.create_task(self._download(url))
+        self.filling[url] = task
+        task.add_done_callback(lambda _: self.filling.pop(url, None))
+
+    async def _download(self, url):
+        name = self._filename(url)
+        path = os.path.join(self.directory, name)
+        part = f"{path}.{os.getpid()}.part"
+        size = 0
+        active_temp_files.add(part)
+        try:
+            async with http_client.get(url, timeout=300) as resp:
+                if resp.status != 200:
+                    print(f"⚠️ Audio cache fill failed with status {resp.status}")
+                    self.fill_errors += 1
+                    return
+                with open(part, 'wb') as f:
+                    async for chunk in resp.content.iter_chunked(AUDIO_CACHE_CHUNK):
+                        f.write(chunk)
+                        size += len(chunk)
+            os.replace(part, path)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Audio cache fill timeout for {url}")
+            self.fill_errors += 1
+            return
+        except aiohttp.ClientError as e:
+            print(f"🔌 Network error filling audio cache: {e}")
+            self.fill_errors += 1
+            return
+        except Exception as e:
+            print(f"❌ Unexpected audio cache error: {e}")
+            self.fill_errors += 1
+            return
+        finally:
+            active_temp_files.discard(part)
+            if os.path.exists(part):
+                try:
+                    os.remove(part)
+                except OSError:
+                    pass
+
+        if name in self.entries:
+            self.total_bytes -= self.entries.pop(name)
+        self.entries[name] = size
+        self.total_bytes += size
+        self.fills += 1
+        self._evict()
+
+    @staticmethod
+    def expected_length(source):
+        """
+        Seconds a recording source outputs when it plays its whole range. FFmpeg cuts at -t
+        (end - seek), which drops the apad tail unless the file runs out first; passthrough
+        sources add their silence frames after the cut.
+        """
+        url, seek_time, end_time = source.clip_key
+        length = end_time - seek_time
+        duration = duration_cache.get(url)  # The last verse's end is only an estimate
+        if getattr(source, 'passthrough', False):
+            if duration:
+                length = min(length, duration - seek_time)
+            return length + TAIL_PAD_SECONDS
+        if duration:
+            return min(length, duration - seek_time + TAIL_PAD_SECONDS)
+        return length
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            name, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'files': len(self.entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'fills': self.fills,
+            'fill_errors': self.fill_errors,
+            'evictions': self.evictions,
+            'filling': len(self.filling),
+        }
+
+audio_cache = AudioCache(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_MB * 1024 * 1024)
+
+def ffmpeg_input_options(source):
+    """Reconnect flags only make sense for remote inputs; cached files are read locally"""
+    if source.startswith(('http://', 'https://')):
+        return "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+    return ""
+
+def validate_audio_source(source):
+    if not source or not isinstance(source, str):
+        raise ValueError("Invalid audio URL")
+    if not source.startswith(('http://', 'https://')) and not os.path.isfile(source):
+        raise ValueError("URL must start with http:// or https://")
 
 # === ENHANCED AUDIO WRAPPER WITH TIMESTAMP SEEKING ===
-class SafeAudioWithSeek(FFmpegPCMAudio):
-    def __init__(self, source_url, seek_time=None, end_time=None, method='hybrid'):
+class AudioSourceMixin:
+    """Behaviour shared by the bot's FFmpeg sources: playback clock, pre-buffering and end-of-stream"""
+    _prebuffer = None
+    seek_time = 0
+    frames = 0       # 20 ms frames actually handed to the voice client
+    eos_time = None  # perf_counter() when the last frame (including the padded tail) was consumed
+    recorder = None  # List collecting every packet played, for the clip cache
+    requested_at = None  # perf_counter() of the play command, until its first frame is out
+    clip_key = None
+    ranged_reader = None  # OggRangeReader feeding FFmpeg's stdin, for indexed seeks
+
+    def cleanup(self):
+        super().cleanup()
+        if self.ranged_reader is not None:
+            self.ranged_reader.close()
+
+    def prime(self, frames):
+        """Decode the first frames before playback starts (blocking, run it in an executor)"""
+        buffered = deque()
+        while len(buffered) < frames:
+            data = self._read_frame()
+            if not data:
+                break
+            buffered.append(data)
+        self._prebuffer = buffered
+        return len(buffered)
+
+    def read(self):
+        if self._prebuffer:
+            data = self._prebuffer.popleft()
+        else:
+            data = self._read_frame()
+        if data:
+            self.frames += 1
+            if self.recorder is not None:
+                self.recorder.append(data)
+            if self.requested_at is not None:
+                first_audio_seconds.observe(time.perf_counter() - self.requested_at)
+                self.requested_at = None
+        elif self.eos_time is None:
+            self.eos_time = time.perf_counter()
+        return data
+
+    @property
+    def reached_eos(self):
+        """True if playback ran to the real end, False if it was stopped or skipped"""
+        return self.eos_time is not None
+
+    def _read_frame(self):
+        return super().read()
+
+    def played(self):
+        """Seconds of audio delivered so far; stands still while paused or stalled"""
+        return self.frames * FRAME_SECONDS
+
+    def position(self):
+        """Monotonic position in the chapter audio, in seconds (includes the seek offset)"""
+        return self.seek_time + self.frames * FRAME_SECONDS
+
+    def remaining(self):
+        return self.duration - self.played()
+
+class SafeAudioWithSeek(AudioSourceMixin, FFmpegPCMAudio):
+    def __init__(self, source_url, seek_time=None, end_time=None, method='hybrid', duration=None, ranged=None):
         # Validate inputs
-        if not source_url or not isinstance(source_url, str):
-            raise ValueError("Invalid audio URL")
-        if not source_url.startswith(('http://', 'https://')):
-            raise ValueError("URL must start with http:// or https://")
+        validate_audio_source(source_url)
         if seek_time and (seek_time < 0 or seek_time > 86400):  # Max 24 hours
             raise ValueError("Invalid seek_time: must be between 0 and 86400 seconds")
         if end_time and seek_time and end_time <= seek_time:
@@ -132,160 +857,1056 @@ class SafeAudioWithSeek(FFmpegPCMAudio):
         self.seek_time = max(0, seek_time) if seek_time else 0
         self.end_time = end_time
         self.method = method
-        self.tempfile_path = None
         
         # Build FFmpeg options with safer formatting
-        before_opts = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
         options = "-vn -af apad=pad_dur=2"
-        
-        if self.seek_time > 0:
-            before_opts += f" -ss {self.seek_time:.2f}"
+        if ranged:
+            # Indexed seek: stdin starts at a page just before seek_time, trim the rest on output
+            self.ranged_reader, skip = ranged
+            source, pipe, before_opts = self.ranged_reader, True, "-f ogg"
+            options += f" -ss {skip:.2f}"
+        else:
+            source, pipe, before_opts = source_url, False, ffmpeg_input_options(source_url)
+            if self.seek_time > 0:
+                before_opts += f" -ss {self.seek_time:.2f}"
         
         if end_time and end_time > self.seek_time:
             duration = end_time - self.seek_time
             options += f" -t {duration:.2f}"
         
         try:
-            super().__init__(source_url, before_options=before_opts, options=options)
+            spawned = time.perf_counter()
+            super().__init__(source, pipe=pipe, before_options=before_opts, options=options)
+            ffmpeg_spawn_seconds.observe(time.perf_counter() - spawned)
         except Exception as e:
             print(f"❌ FFmpeg initialization error: {e}")
+            if self.ranged_reader is not None:
+                self.ranged_reader.close()
             raise
         
-        try:
-            # Try to get duration information
-            if seek_time:
-                # For seeking, we'll use a simplified duration estimation
-                self.duration = (end_time - seek_time) if end_time else 60.0
-            else:
-                # Get actual duration for non-seeked audio
-                with urlopen(source_url, timeout=30) as response:
-                    with NamedTemporaryFile(delete=False) as tmp_file:
-                        tmp_file.write(response.read())
-                        tmp_file.flush()
-                        audio = OggVorbis(tmp_file.name)
-                        self.duration = audio.info.length
-                        self.tempfile_path = tmp_file.name
-        except (URLError, HTTPError, socket.timeout) as e:
-            print(f"🔌 Network error downloading audio metadata: {e}")
-            self.duration = 60
-            self.tempfile_path = None
-        except Exception as e:
-            print(f"⚠️ Audio metadata error: {e}")
-            self.duration = 60
-            self.tempfile_path = None
-        
-        self.start_time = time.time()
-
-    def elapsed(self):
-        return time.time() - self.start_time
+        if end_time and seek_time:
+            # For seeking, the clip length is known up front
+            self.duration = end_time - seek_time
+        elif duration:
+            # Resolved asynchronously by the caller (see resolve_duration)
+            self.duration = duration
+        else:
+            self.duration = DEFAULT_DURATION if not end_time else end_time - self.seek_time
 
-    def cleanup(self):
-        try:
-            if self.tempfile_path and os.path.exists(self.tempfile_path):
-                os.remove(self.tempfile_path)
-                self.tempfile_path = None
-        except Exception as e:
-            print(f"⚠️ Cleanup error: {e}")
-
-class SafeAudio(FFmpegPCMAudio):
-    def __init__(self, source_url):
-        # Validate URL
-        if not source_url or not isinstance(source_url, str):
-            raise ValueError("Invalid audio URL")
-        if not source_url.startswith(('http://', 'https://')):
-            raise ValueError("URL must start with http:// or https://")
+class SafeAudio(AudioSourceMixin, FFmpegPCMAudio):
+    def __init__(self, source_url, duration=None):
+        # Validate URL (or cached local path)
+        validate_audio_source(source_url)
         
-        before_opts = "-reconnect 1 -reconnect_streamed 1 -reconnect_delay_max 5"
+        before_opts = ffmpeg_input_options(source_url)
         options = "-vn -af apad=pad_dur=2"
         
         try:
+            spawned = time.perf_counter()
             super().__init__(source_url, before_options=before_opts, options=options)
+            ffmpeg_spawn_seconds.observe(time.perf_counter() - spawned)
         except Exception as e:
             print(f"❌ FFmpeg initialization error: {e}")
             raise
         
+        # Real length is filled in later by attach_duration() without blocking the loop
+        self.duration = duration or DEFAULT_DURATION
+
+class SafeOpusAudio(AudioSourceMixin, FFmpegOpusAudio):
+    """
+    Opus-native variant of SafeAudio / SafeAudioWithSeek.
+    With passthrough=True the input is already Ogg/Opus and is stream-copied; apad can't run
+    on copied packets, so the silent tail is appended here as Opus silence frames instead.
+    """
+    def __init__(self, source_url, seek_time=None, end_time=None, duration=None, passthrough=False, ranged=None):
+        validate_audio_source(source_url)
+        if seek_time and (seek_time < 0 or seek_time > 86400):  # Max 24 hours
+            raise ValueError("Invalid seek_time: must be between 0 and 86400 seconds")
+        if end_time and seek_time and end_time <= seek_time:
+            raise ValueError("end_time must be greater than seek_time")
+
+        self.seek_time = max(0, seek_time) if seek_time else 0
+        self.end_time = end_time
+        self.passthrough = passthrough
+
+        options = "-vn" if passthrough else "-vn -af apad=pad_dur=2"
+        if ranged:
+            # Indexed seek (see SafeAudioWithSeek)
+            self.ranged_reader, skip = ranged
+            source, pipe, before_opts = self.ranged_reader, True, "-f ogg"
+            options += f" -ss {skip:.2f}"
+        else:
+            source, pipe, before_opts = source_url, False, ffmpeg_input_options(source_url)
+            if self.seek_time > 0:
+                before_opts += f" -ss {self.seek_time:.2f}"
+
+        if end_time and end_time > self.seek_time:
+            options += f" -t {end_time - self.seek_time:.2f}"
+
         try:
-            with urlopen(source_url, timeout=30) as response:
-                with NamedTemporaryFile(delete=False) as tmp_file:
-                    tmp_file.write(response.read())
-                    tmp_file.flush()
-                    audio = OggVorbis(tmp_file.name)
-                    self.duration = audio.info.length
-                    self.tempfile_path = tmp_file.name
-        except (URLError, HTTPError, socket.timeout) as e:
-            print(f"🔌 Network error downloading audio metadata: {e}")
-            self.duration = 60
-            self.tempfile_path = None
+            spawned = time.perf_counter()
+            super().__init__(source, pipe=pipe, codec='copy' if passthrough else None, bitrate=OPUS_BITRATE,
+                             before_options=before_opts, options=options)
+            ffmpeg_spawn_seconds.observe(time.perf_counter() - spawned)
         except Exception as e:
-            print(f"⚠️ Audio metadata error: {e}")
-            self.duration = 60
-            self.tempfile_path = None
-        
-        self.start_time = time.time()
+            print(f"❌ FFmpeg initialization error: {e}")
+            if self.ranged_reader is not None:
+                self.ranged_reader.close()
+            raise
 
-    def elapsed(self):
-        return time.time() - self.start_time
+        self._header_packets = 2  # OpusHead + OpusTags aren't audio
+        self._pad_frames = int(TAIL_PAD_SECONDS / FRAME_SECONDS) if passthrough else 0
 
-    def cleanup(self):
+        if end_time and seek_time:
+            self.duration = end_time - seek_time
+        elif duration:
+            self.duration = duration
+        else:
+            self.duration = DEFAULT_DURATION if not end_time else end_time - self.seek_time
+
+    def _read_frame(self):
+        data = super()._read_frame()
+        while self._header_packets and data[:4] == b'Opus':
+            self._header_packets -= 1
+            data = super()._read_frame()
+        self._header_packets = 0
+        if data or not self._pad_frames:
+            return data
+        self._pad_frames -= 1
+        return OPUS_SILENCE_FRAME
+
+def create_audio_source(entry, seek_time=None, end_time=None, mode=None):
+    """Build the audio source for a manifest entry according to mode (default PLAYBACK_MODE)"""
+    duration = duration_cache.get(entry.url) or entry.duration
+
+    if (mode or PLAYBACK_MODE) == 'opus':
+        opus_url = entry.opus_url
+        if opus_url:
+            audio_path = audio_cache.lookup(opus_url) or opus_url
+            source = SafeOpusAudio(audio_path, seek_time=seek_time, end_time=end_time, duration=duration,
+                                   passthrough=True, ranged=ranged_input(audio_path, seek_time, end_time))
+        else:
+            audio_path = audio_cache.lookup(entry.url) or entry.url
+            source = SafeOpusAudio(audio_path, seek_time=seek_time, end_time=end_time, duration=duration,
+                                   ranged=ranged_input(audio_path, seek_time, end_time))
+    else:
+        audio_path = audio_cache.lookup(entry.url) or entry.url
+        if seek_time is not None:
+            source = SafeAudioWithSeek(audio_path, seek_time=seek_time, end_time=end_time, duration=duration,
+                                       ranged=ranged_input(audio_path, seek_time, end_time))
+        else:
+            source = SafeAudio(audio_path, duration=duration)
+    ffmpeg_sources.add(source)  # Lets the reaper tell owned FFmpeg children from orphans
+    return source
+
+def verse_range_bounds(entry, start_verse, end_verse):
+    """
+    Audio bounds for a verse range, padded by one verse of context on each side.
+    Returns (audio_start_verse, audio_end_verse, start_time, end_time).
+    """
+    # Get all verses in the chapter to determine bounds
+    if entry.verses_sorted:
+        min_verse = entry.verses[0]
+        max_verse = entry.verses[-1]
+    else:
+        min_verse = min(entry.verses)
+        max_verse = max(entry.verses)
+    
+    # Extend range by one verse before and after for context
+    # Handle edge cases where we can't extend before verse 1 or after the last verse
+    audio_start_verse = max(start_verse - 1, min_verse)  # One verse before, but not before chapter start
+    audio_end_verse = min(end_verse + 1, max_verse)      # One verse after, but not after chapter end
+    
+    # Calculate actual timing for the extended audio range
+    start_time = get_verse_start_time(entry, audio_start_verse)
+    end_time = get_verse_end_time(entry, audio_end_verse)
+    return audio_start_verse, audio_end_verse, start_time, end_time
+
+def item_audio_bounds(item):
+    """(url, seek_time, end_time) a playback item plays; equal for items that sound identical"""
+    index, start_verse, end_verse, snapshot = item
+    entry = snapshot.chapters[index]
+    if start_verse is None:
+        return entry.url, None, None
+    _, _, start_time, end_time = verse_range_bounds(entry, start_verse, end_verse)
+    return entry.url, start_time, end_time
+
+def create_item_source(item, mode=None):
+    """Build the audio source for a playback item (index, start_verse, end_verse, snapshot)"""
+    index, _, _, snapshot = item
+    _, start_time, end_time = item_audio_bounds(item)
+    return create_audio_source(snapshot.chapters[index], seek_time=start_time, end_time=end_time, mode=mode)
+
+# === CLIP CACHE ===
+class Clip:
+    """A fully played verse range, kept as the Opus packets FFmpeg produced for it"""
+    __slots__ = ('packets', 'size', 'seek_time', 'duration', 'plays')
+
+    def __init__(self, packets, seek_time, duration):
+        self.packets = packets
+        self.size = sum(len(p) for p in packets) + CLIP_PACKET_OVERHEAD * len(packets)
+        self.seek_time = seek_time
+        self.duration = duration
+        self.plays = 0
+
+class ClipSource(AudioSourceMixin, discord.AudioSource):
+    """Plays a Clip from memory: no FFmpeg, no HTTP, no decoding"""
+
+    def __init__(self, clip):
+        self.clip = clip
+        self.next_packet = 0
+        self.seek_time = clip.seek_time
+        self.duration = clip.duration
+
+    def is_opus(self):
+        return True
+
+    def _read_frame(self):
+        packets = self.clip.packets
+        if self.next_packet >= len(packets):
+            return b''
+        self.next_packet += 1
+        return packets[self.next_packet - 1]
+
+class ClipCache:
+    """
+    Hot verse ranges (John 3:16, Psalm 23, ...) as in-memory Opus clips. A range is recorded
+    the next time it plays after it has been asked for CLIP_ADMIT_REQUESTS times; after that
+    every play comes straight from memory. Request counts decay over time, and when the
+    memory budget is exceeded the least requested clips go first.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = {}     # {(url, seek_time, end_time): Clip}
+        self.popularity = {}  # {same key: decayed request count}, clips or not
+        self.total_bytes = 0
+        self.lookups_since_decay = 0
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def lookup(self, item, count=True):
+        """
+        Returns (source, record_key): a ClipSource on a hit; otherwise None plus the key to
+        record this play under if the range is hot enough, else (None, None). Prefetches
+        pass count=False and call count() only if their source actually gets played.
+        """
+        if not self.enabled or item[1] is None:
+            return None, None  # Whole chapters are too big to be worth holding
+        key = item_audio_bounds(item)
+        if count:
+            score = self._request(key)
+        else:
+            score = self.popularity.get(key, 0.0) + 1.0  # What it will be if this play happens
+        clip = self.entries.get(key)
+        if clip is not None:
+            if count:
+                self.hits += 1
+                clip.plays += 1
+            return ClipSource(clip), None
+        if count:
+            self.misses += 1
+        return None, (key if score >= CLIP_ADMIT_REQUESTS else None)
+
+    def count(self, item, source):
+        """Count a request for an item looked up with count=False, now that source is playing"""
+        if not self.enabled or item[1] is None:
+            return
+        self._request(item_audio_bounds(item))
+        if isinstance(source, ClipSource):
+            self.hits += 1
+            source.clip.plays += 1
+        else:
+            self.misses += 1
+
+    def _request(self, key):
+        score = self.popularity.get(key, 0.0) + 1.0
+        self.popularity[key] = score
+        self._age()
+        return score
+
+    def finish(self, source, error=None):
+        """Keep what a recording source played, if it played the whole range without errors"""
+        packets, source.recorder = source.recorder, None
+        if packets is None or error is not None or not source.reached_eos:
+            return
+        # A failed FFmpeg or a cut-off download also ends in an empty read; only the length tells
+        expected = self.expected_length(source)
+        played = len(packets) * FRAME_SECONDS
+        if abs(played - expected) > CLIP_LENGTH_TOLERANCE:
+            print(f"⚠️ Not caching clip for {source.clip_key[0]}: recorded {played:.2f}s, expected {expected:.2f}s")
+            return
+        clip = Clip(packets, source.seek_time, source.duration)
+        if clip.size > self.max_bytes // 8:
+            return  # One long range shouldn't push out dozens of short ones
+        old = self.entries.pop(source.clip_key, None)
+        if old is not None:
+            self.total_bytes -= old.size
+        self.entries[source.clip_key] = clip
+        self.total_bytes += clip.size
+        self.recorded += 1
+        self._evict()
+
+    @staticmethod
+    def expected_length(source):
+        """
+        Seconds a recording source outputs when it plays its whole range. FFmpeg cuts at -t
+        (end - seek), which drops the apad tail unless the file runs out first; passthrough
+        sources add their silence frames after the cut.
+        """
+        url, seek_time, end_time = source.clip_key
+        length = end_time - seek_time
+        duration = duration_cache.get(url)  # The last verse's end is only an estimate
+        if getattr(source, 'passthrough', False):
+            if duration:
+                length = min(length, duration - seek_time)
+            return length + TAIL_PAD_SECONDS
+        if duration:
+            return min(length, duration - seek_time + TAIL_PAD_SECONDS)
+        return length
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            key = min(self.entries, key=lambda k: self.popularity.get(k, 0.0))
+            self.total_bytes -= self.entries.pop(key).size
+            self.evictions += 1
+
+    def _age(self):
+        """Halve every request count now and then, so yesterday's favourites can fall out"""
+        self.lookups_since_decay += 1
+        if self.lookups_since_decay < CLIP_DECAY_LOOKUPS:
+            return
+        self.lookups_since_decay = 0
+        self.popularity = {key: score / 2 for key, score in self.popularity.items()
+                           if score >= 1.0 or key in self.entries}
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'clips': len(self.entries),
+            'bytes': self.total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'recorded': self.recorded,
+            'evictions': self.evictions,
+            'tracked': len(self.popularity),
+        }
+
+clip_cache = ClipCache(CLIP_CACHE_MB * 1024 * 1024)
+
+def open_item_source(item, speculative=False):
+    """
+    Source for a playback item: its cached clip when there is one, otherwise FFmpeg.
+    speculative (prefetches) leaves the clip cache's request counts alone.
+    """
+    source, record_key = clip_cache.lookup(item, count=not speculative)
+    if source is not None:
+        return source
+    if record_key is None:
+        return create_item_source(item)
+    # Hot enough to keep: play it as Opus, whatever PLAYBACK_MODE says, and record the packets
+    source = create_item_source(item, mode='opus')
+    source.clip_key = record_key
+    source.recorder = []
+    return source
+
+# === AUDIO METADATA ===
+def parse_ogg_header(head):
+    """
+    Read (sample_rate, pre_skip) from the codec identification header in the first Ogg page.
+    Returns (None, 0) if neither a Vorbis nor an Opus header is present.
+    """
+    idx = head.find(b'\x01vorbis')
+    if idx != -1 and len(head) >= idx + 16:
+        # packet type(1) + "vorbis"(6) + version(4) + channels(1) + sample_rate(4)
+        return struct.unpack_from('<I', head, idx + 12)[0], 0
+    idx = head.find(b'OpusHead')
+    if idx != -1 and len(head) >= idx + 12:
+        # Opus granules always count 48 kHz samples, offset by the encoder pre-skip
+        return 48000, struct.unpack_from('<H', head, idx + 10)[0]
+    return None, 0
+
+def parse_ogg_last_granule(tail):
+    """Find the granule position of the last complete Ogg page in a tail chunk"""
+    pos = tail.rfind(b'OggS')
+    while pos != -1:
+        if pos + 14 <= len(tail):
+            granule = struct.unpack_from('<q', tail, pos + 6)[0]
+            if granule >= 0:  # -1 marks pages with no packet ending on them
+                return granule
+        pos = tail.rfind(b'OggS', 0, pos)
+    return None
+
+async def probe_ogg_duration(url):
+    """Learn an Ogg file's length from two small HTTP Range reads (head + last page)"""
+    async with http_client.get(url, timeout=10, headers={'Range': f'bytes=0-{OGG_HEAD_PROBE_BYTES - 1}'}) as resp:
+        if resp.status not in (200, 206):
+            print(f"⚠️ Duration probe failed with status {resp.status}")
+            return None
+        # A 200 means Range was ignored; only read what we need and drop the rest
+        head = await resp.content.read(OGG_HEAD_PROBE_BYTES)
+    sample_rate, pre_skip = parse_ogg_header(head)
+    if not sample_rate:
+        print(f"⚠️ Unrecognised Ogg header for {url}")
+        return None
+    async with http_client.get(url, timeout=10, headers={'Range': f'bytes=-{OGG_TAIL_PROBE_BYTES}'}) as resp:
+        if resp.status != 206:
+            print(f"⚠️ Server ignored Range request for {url} (status {resp.status})")
+            return None
+        tail = await resp.read()
+    granule = parse_ogg_last_granule(tail)
+    if granule is None:
+        return None
+    return max(0, granule - pre_skip) / sample_rate
+
+def read_local_ogg_duration(path):
+    """Same probe as probe_ogg_duration, against a cached local file"""
+    with open(path, 'rb') as f:
+        head = f.read(OGG_HEAD_PROBE_BYTES)
+        f.seek(max(0, os.path.getsize(path) - OGG_TAIL_PROBE_BYTES))
+        tail = f.read()
+    sample_rate, pre_skip = parse_ogg_header(head)
+    granule = parse_ogg_last_granule(tail)
+    if not sample_rate or granule is None:
+        return None
+    return max(0, granule - pre_skip) / sample_rate
+
+async def resolve_duration(url, known=None):
+    """
+    Resolve a chapter's audio length without downloading the file.
+    Order: manifest value -> cached probe result -> HTTP Range probe of the last Ogg page.
+    """
+    if known:
+        return float(known)
+    if url in duration_cache:
+        return duration_cache[url]
+
+    local_path = audio_cache.peek(url)
+    if local_path:
         try:
-            if self.tempfile_path and os.path.exists(self.tempfile_path):
-                os.remove(self.tempfile_path)
-                self.tempfile_path = None
+            duration = read_local_ogg_duration(local_path)
+        except OSError:
+            duration = None
+        if duration:
+            duration_cache[url] = duration
+            return duration
+
+    task = duration_probes.get(url)
+    if task is None:
+        task = asyncio.create_task(probe_ogg_duration(url))
+        duration_probes[url] = task
+    try:
+        duration = await asyncio.shield(task)
+    except asyncio.TimeoutError:
+        print(f"⏱️ Duration probe timeout for {url}")
+        duration = None
+    except aiohttp.ClientError as e:
+        print(f"🔌 Network error probing audio duration: {e}")
+        duration = None
+    except Exception as e:
+        print(f"⚠️ Audio metadata error: {e}")
+        duration = None
+    finally:
+        if task.done():
+            duration_probes.pop(url, None)
+
+    if duration:
+        duration_cache[url] = duration
+    return duration
+
+async def attach_duration(source, url, known=None):
+    """Fill in source.duration once it's known; playback starts without waiting for it"""
+    duration = await resolve_duration(url, known)
+    if duration:
+        source.duration = duration
+
+# === OGG SEEK INDEX ===
+class OggSeekIndex:
+    """
+    Page boundaries of one Ogg file: byte offset of a page and the granule position the
+    audio has reached when that page starts, sampled about every SEEK_INDEX_STEP_SECONDS.
+    Also keeps the header pages, which have to be sent ahead of any mid-file byte range.
+    """
+    __slots__ = ('rate', 'pre_skip', 'header', 'offsets', 'granules')
+
+    def __init__(self, rate, pre_skip, header, offsets, granules):
+        self.rate = rate
+        self.pre_skip = pre_skip
+        self.header = bytes(header)
+        self.offsets = offsets    # array('Q') of page start offsets
+        self.granules = granules  # array('q') of granule positions at those pages
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def time_at(self, i):
+        return max(0, self.granules[i] - self.pre_skip) / self.rate
+
+    def start_for(self, seconds):
+        """(byte offset, audio time there) of the latest page boundary safely before seconds"""
+        target = seconds * self.rate + self.pre_skip
+        i = max(0, bisect_right(self.granules, target) - 1)
+        if i and seconds - self.time_at(i) < SEEK_PREROLL_SECONDS:
+            i -= 1  # Give the decoder a little audio to settle before the cut
+        return self.offsets[i], self.time_at(i)
+
+    def end_for(self, seconds):
+        """Last byte needed to play up to seconds (with a page of margin), or None for the end of the file"""
+        target = seconds * self.rate + self.pre_skip
+        i = bisect_left(self.granules, target) + 1
+        return self.offsets[i] - 1 if i < len(self.offsets) else None
+
+    def to_json(self):
+        return {'rate': self.rate, 'pre_skip': self.pre_skip,
+                'header': base64.b64encode(self.header).decode('ascii'),
+                'offsets': list(self.offsets), 'granules': list(self.granules)}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(data['rate'], data['pre_skip'], base64.b64decode(data['header']),
+                   array('Q', data['offsets']), array('q', data['granules']))
+
+class OggPageScanner:
+    """Builds an OggSeekIndex from a file fed in order, in chunks of any size"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offset = 0          # File offset of buffer[0]
+        self.header = bytearray()
+        self.in_header = True
+        self.rate = None
+        self.pre_skip = 0
+        self.granule = 0         # Where the audio is after the pages seen so far
+        self.offsets = array('Q')
+        self.granules = array('q')
+        self.failed = False
+
+    def feed(self, data):
+        if self.failed:
+            return
+        buf = self.buffer
+        buf += data
+        while len(buf) >= 27:
+            if buf[:4] != b'OggS':
+                self.failed = True
+                return
+            nsegs = buf[26]
+            if len(buf) < 27 + nsegs:
+                break
+            size = 27 + nsegs + sum(buf[27:27 + nsegs])
+            if len(buf) < size:
+                break
+            self._page(bytes(buf[:size]))
+            del buf[:size]
+            self.offset += size
+
+    def _page(self, page):
+        granule = struct.unpack_from('<q', page, 6)[0]
+        if self.in_header:
+            if granule <= 0:
+                # Identification and comment headers (granule 0, or -1 on continued pages)
+                self.header += page
+                if self.rate is None:
+                    self.rate, self.pre_skip = parse_ogg_header(page)
+                if len(self.header) > SEEK_INDEX_MAX_HEADER:
+                    self.failed = True  # e.g. cover art in the tags; not worth resending
+                return
+            self.in_header = False
+        if not self.granules or self.granule - self.granules[-1] >= SEEK_INDEX_STEP_SECONDS * (self.rate or 48000):
+            self.offsets.append(self.offset)
+            self.granules.append(self.granule)
+        if granule > 0:
+            self.granule = granule
+
+    def result(self):
+        if self.failed or not self.rate or not self.offsets:
+            return None
+        return OggSeekIndex(self.rate, self.pre_skip, self.header, self.offsets, self.granules)
+
+class OggRangeReader:
+    """
+    What FFmpeg reads on stdin for an indexed seek: the header pages, then the body of a
+    single HTTP Range request. read() is called on discord.py's pipe-writer thread and
+    pulls from the response on the bot's loop, so the download keeps pace with FFmpeg.
+    """
+    def __init__(self, url, header, start, end):
+        self.loop = asyncio.get_running_loop()
+        self.pending = header
+        self.closed = False
+        byte_range = f"bytes={start}-{'' if end is None else end}"
+        self.response = self.loop.create_task(self._open(url, byte_range))
+
+    async def _open(self, url, byte_range):
+        resp = await http_client.get(url, timeout=300, headers={'Range': byte_range})
+        if resp.status != 206:
+            resp.release()
+            raise aiohttp.ClientError(f"Range request for {url} answered with status {resp.status}")
+        return resp
+
+    async def _read(self, n):
+        resp = await self.response
+        return await resp.content.read(n)
+
+    def read(self, n):
+        if self.pending:
+            data, self.pending = self.pending[:n], self.pending[n:]
+            return data
+        if self.closed:
+            return b''
+        try:
+            return asyncio.run_coroutine_threadsafe(self._read(n), self.loop).result(HTTP_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"🔌 Ranged audio read failed: {type(e).__name__}: {e}")
+            return b''
+
+    def close(self):
+        """
+        Safe from any thread. The connection goes back to the pool if the body was read to
+        the end; one abandoned mid-body can't be reused, so it's closed instead.
+        """
+        if not self.closed:
+            self.closed = True
+            self.loop.call_soon_threadsafe(self._close)
+
+    def _close(self):
+        if not self.response.done():
+            self.response.cancel()
+        elif not self.response.cancelled() and self.response.exception() is None:
+            resp = self.response.result()
+            if resp.content.at_eof():
+                resp.release()
+            else:
+                resp.close()
+
+class SeekIndexStore:
+    """
+    Seek indexes by audio URL: a bounded set in memory, all of them on disk. A missing
+    index is built in the background, from the audio cache's copy when there is one and
+    otherwise by streaming the file once, so only the first remote seek pays FFmpeg's
+    own search through the file.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        self.indexes = OrderedDict()  # {url: OggSeekIndex}, least recently used first
+        self.unindexable = set()      # URLs that aren't Ogg or have oversized headers
+        self.building = {}            # {url: asyncio.Task}
+        self.builds = 0
+        self.build_errors = 0
+        self.ranged_plays = 0
+        self.unindexed_plays = 0
+
+    def _path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, url):
+        index = self.indexes.get(url)
+        if index is not None:
+            self.indexes.move_to_end(url)
+            return index
+        try:
+            with open(self._path(url)) as f:
+                index = OggSeekIndex.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(url, index)
+        return index
+
+    def _remember(self, url, index):
+        self.indexes[url] = index
+        while len(self.indexes) > SEEK_INDEX_MEMORY_ENTRIES:
+            self.indexes.popitem(last=False)
+
+    def ensure(self, url):
+        if url in self.building or url in self.unindexable:
+            return
+        task = asyncio.create_task(self._build(url))
+        self.building[url] = task
+        task.add_done_callback(lambda _: self.building.pop(url, None))
+
+    async def _build(self, url):
+        fill = audio_cache.filling.get(url)
+        if fill is not None:
+            await asyncio.shield(fill)  # Scan the cached copy instead of downloading twice
+        scanner = OggPageScanner()
+        try:
+            local_path = audio_cache.peek(url)
+            if local_path:
+                await asyncio.get_running_loop().run_in_executor(None, scan_ogg_file, scanner, local_path)
+            else:
+                async with http_client.get(url, timeout=300) as resp:
+                    if resp.status != 200:
+                        print(f"⚠️ Seek index download failed with status {resp.status}")
+                        self.build_errors += 1
+                        return
+                    async for chunk in resp.content.iter_chunked(AUDIO_CACHE_CHUNK):
+                        scanner.feed(chunk)
+                        if scanner.failed:
+                            break
+        except (OSError, asyncio.TimeoutError, aiohttp.ClientError) as e:
+            print(f"⚠️ Couldn't build seek index for {url}: {type(e).__name__}: {e}")
+            self.build_errors += 1
+            return
         except Exception as e:
-            print(f"⚠️ Cleanup error: {e}")
+            # Malformed pages and the like; this file keeps playing through FFmpeg's own seek
+            print(f"❌ Unexpected error building seek index for {url}: {type(e).__name__}: {e}")
+            self.build_errors += 1
+            self.unindexable.add(url)
+            return
+        index = scanner.result()
+        if index is None:
+            self.unindexable.add(url)
+            return
+        self._remember(url, index)
+        self.builds += 1
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            write_file_atomic(self._path(url), json.dumps(index.to_json(), separators=(',', ':')).encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ Couldn't save seek index: {e}")
+        print(f"🧭 Seek index for {url}: {len(index)} entries, {len(index.header)} header bytes")
+
+    def sweep_partials(self):
+        """Remove abandoned .tmp files (interrupted index saves). Returns (files, bytes) removed."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return 0, 0
+        return remove_stale_temp_files(os.path.join(self.directory, name)
+                                       for name in names if name.endswith('.tmp'))
+
+    def stats(self):
+        return {
+            'in_memory': len(self.indexes),
+            'building': len(self.building),
+            'builds': self.builds,
+            'build_errors': self.build_errors,
+            'unindexable': len(self.unindexable),
+            'ranged_plays': self.ranged_plays,
+            'unindexed_plays': self.unindexed_plays,
+        }
+
+def scan_ogg_file(scanner, path):
+    with open(path, 'rb') as f:
+        while not scanner.failed:
+            chunk = f.read(AUDIO_CACHE_CHUNK)
+            if not chunk:
+                break
+            scanner.feed(chunk)
+
+seek_indexes = SeekIndexStore(SEEK_INDEX_DIR)
+
+def ranged_input(url, seek_time, end_time):
+    """
+    (reader, skip) to play a remote Ogg file from seek_time through one Range request:
+    FFmpeg gets the stream from the page before seek_time and trims `skip` seconds itself.
+    None when there's no index yet (one is started) and FFmpeg should seek on its own.
+    """
+    if not seek_time or not url.startswith(('http://', 'https://')):
+        return None
+    index = seek_indexes.get(url)
+    if index is None:
+        seek_indexes.ensure(url)
+        seek_indexes.unindexed_plays += 1
+        return None
+    start, page_time = index.start_for(seek_time)
+    end = index.end_for(end_time) if end_time else None
+    seek_indexes.ranged_plays += 1
+    return OggRangeReader(url, index.header, start, end), seek_time - page_time
+
+# === PLAYBACK SESSIONS ===
+SESSION_STALE_SECONDS = 300  # A session that never got (or lost) its voice connection is dropped after this
+
+class SessionContext:
+    """
+    Stands in for a command context when playback continues (or a reading plan starts)
+    with nobody typing. Sessions keep just the two channels, never the original ctx.
+    """
+    __slots__ = ('author', 'channel', 'guild')
+
+    def __init__(self, voice_channel, text_channel):
+        # play_entry and ensure_voice_connection only use ctx.author.voice.channel
+        self.author = types.SimpleNamespace(voice=types.SimpleNamespace(channel=voice_channel))
+        self.channel = text_channel
+        self.guild = voice_channel.guild
+
+    async def send(self, *args, **kwargs):
+        return await self.channel.send(*args, **kwargs)
+
+class PlaybackSession:
+    """
+    Everything tracked for one voice channel. Tearing a session down is one registry pop
+    plus close(), so no command can forget a piece of state.
+    """
+    __slots__ = ('vcid', 'vc', 'voice_channel', 'text_channel', 'index', 'manifest', 'queue',
+                 'stop_after', 'stream', 'lead', 'prefetch', 'eos_time', 'broadcast',
+                 'plan_start', 'idle_since', 'created_at', 'active_at')
+
+    def __init__(self, vcid):
+        self.vcid = vcid
+        self.vc = None
+        self.voice_channel = None
+        self.text_channel = None   # Where "Now playing", the panel and verse embeds go
+        self.index = -1            # Index of the current item in self.manifest
+        self.manifest = None       # ManifestSnapshot the current item came from
+        self.queue = []            # [(index, start_verse, end_verse, snapshot), ...]
+        self.stop_after = False    # A verse range is playing; don't continue to the next chapter
+        self.stream = None         # Live VerseStream
+        self.lead = None           # LeadEstimator, kept across chapters
+        self.prefetch = None       # Prefetch of the next item
+        self.eos_time = None       # perf_counter() end of the item we're advancing from
+        self.broadcast = False     # Items play through shared broadcasts
+        self.plan_start = None     # Epoch start time if this is a reading plan's session
+        self.idle_since = None     # When the reaper first saw the connection idle or alone
+        self.created_at = time.monotonic()
+        self.active_at = self.created_at
+
+    def bind(self, ctx):
+        """Remember where a command came from (just the channels, not ctx itself)"""
+        self.voice_channel = ctx.author.voice.channel
+        self.text_channel = ctx.channel
+        self.active_at = time.monotonic()
+
+    def context(self):
+        if self.voice_channel is None or self.text_channel is None:
+            return None
+        return SessionContext(self.voice_channel, self.text_channel)
+
+    def cancel_stream(self):
+        if self.stream is not None:
+            self.stream.cancel()
+            self.stream = None
+
+    def close(self):
+        """Stop everything this session started; the registry entry is removed by close_session"""
+        try:
+            self.cancel_stream()
+        except Exception:
+            pass
+        discard_prefetch(self)
+        self.queue.clear()
+        self.vc = None
+
+    @property
+    def connected(self):
+        return self.vc is not None and self.vc.is_connected()
+
+    def describe(self):
+        """Point-in-time summary for diagnostics"""
+        now = time.monotonic()
+        vc = self.vc
+        if vc is None or not vc.is_connected():
+            state = 'disconnected'
+        elif vc.is_playing():
+            state = 'playing'
+        elif vc.is_paused():
+            state = 'paused'
+        else:
+            state = 'idle'
+        entry = self.manifest.chapters[self.index] if self.manifest and 0 <= self.index < len(self.manifest) else None
+        return {
+            'vcid': self.vcid,
+            'state': state,
+            'current': entry.label if entry else None,
+            'queue': len(self.queue),
+            'broadcast': self.broadcast,
+            'plan': self.plan_start is not None,
+            'age': now - self.created_at,
+            'inactive': now - self.active_at,
+            'bytes': self.footprint(),
+        }
+
+    def footprint(self):
+        """Approximate bytes held by the session itself (shared manifests and sources excluded)"""
+        size = sys.getsizeof(self) + sys.getsizeof(self.queue)
+        size += sum(sys.getsizeof(item) for item in self.queue)
+        if self.stream is not None:
+            size += sys.getsizeof(self.stream)
+        if self.lead is not None:
+            size += sys.getsizeof(self.lead)
+        return size
+
+def get_session(vcid):
+    return sessions.get(vcid)
+
+def open_session(vcid):
+    session = sessions.get(vcid)
+    if session is None:
+        session = sessions[vcid] = PlaybackSession(vcid)
+    return session
+
+def close_session(vcid):
+    session = sessions.pop(vcid, None)
+    if session is not None:
+        session.close()
+    return session
+
+def is_stale_session(session, now):
+    """No voice connection, and nothing has happened for SESSION_STALE_SECONDS"""
+    return not session.connected and now - session.active_at > SESSION_STALE_SECONDS
+
+def session_stats():
+    now = time.monotonic()
+    live = list(sessions.values())
+    footprint = sum(session.footprint() for session in live)
+    return {
+        'sessions': len(live),
+        'connected': sum(1 for session in live if session.connected),
+        'stale': sum(1 for session in live if is_stale_session(session, now)),
+        'bytes': footprint,
+        'avg_bytes': footprint / len(live) if live else 0,
+        'oldest': max((now - session.created_at for session in live), default=0.0),
+    }
 
 # === UTILITIES ===
-async def fetch_manifest():
-    global manifest_data
+def parse_manifest(raw):
+    """Parse raw manifest JSON straight into the compact [Chapter] form"""
+    manifest = json.loads(raw)
+    if not isinstance(manifest, list) or not manifest:
+        raise ValueError("manifest is not a non-empty list")
+    try:
+        return compact_manifest(manifest)
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"malformed manifest entry: {e!r}") from None
+
+def write_file_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    active_temp_files.add(tmp_path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        active_temp_files.discard(tmp_path)
+
+def save_manifest_snapshot(raw, meta):
+    """Persist the raw manifest bytes and their HTTP validators (blocking; run in an executor)"""
+    try:
+        write_file_atomic(MANIFEST_CACHE_PATH, raw)
+        write_file_atomic(MANIFEST_META_PATH, json.dumps(meta).encode('utf-8'))
+    except OSError as e:
+        print(f"⚠️ Could not save manifest snapshot: {e}")
+
+def save_manifest_meta(meta):
+    """Persist just the HTTP validators and fetch time, after a 304 (blocking; run in an executor)"""
+    try:
+        write_file_atomic(MANIFEST_META_PATH, json.dumps(meta).encode('utf-8'))
+    except OSError as e:
+        print(f"⚠️ Could not save manifest metadata: {e}")
+
+def load_manifest_snapshot():
+    """Warm start: load the last good manifest from disk before talking to R2"""
+    try:
+        with open(MANIFEST_CACHE_PATH, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return False
+    except OSError as e:
+        print(f"⚠️ Ignoring unreadable manifest snapshot: {e}")
+        return False
+
+    meta = {}
+    try:
+        with open(MANIFEST_META_PATH, 'rb') as f:
+            meta = json.loads(f.read())
+    except (OSError, ValueError):
+        pass  # Without validators the next refresh is just an unconditional GET
+
+    try:
+        snapshot = build_manifest_snapshot(raw, meta)
+    except ValueError as e:
+        print(f"⚠️ Ignoring unreadable manifest snapshot: {e}")
+        return False
+    install_manifest(snapshot)
+    age = time.time() - meta.get('fetched_at', time.time())
+    print(f"💾 Loaded {len(snapshot)} chapters from snapshot ({age / 3600:.1f}h old).")
+    return True
+
+async def fetch_manifest(force=False):
+    """
+    Refresh the manifest from R2. Uses ETag / Last-Modified so an unchanged manifest is a
+    304 with nothing to parse (force skips the validators). A new manifest is parsed,
+    indexed and diffed in an executor, then swapped in; any failure leaves the current
+    snapshot in place. Returns a one-line summary, or None if every attempt failed.
+    """
+    async with manifest_reload_lock:
+        return await _fetch_manifest(force)
+
+async def _fetch_manifest(force):
     max_retries = 3
+    loop = asyncio.get_running_loop()
+    current = manifest_for()
     
     for attempt in range(max_retries):
         try:
-            timeout = aiohttp.ClientTimeout(total=30)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(MANIFEST_URL) as resp:
-                    if resp.status == 200:
-                        manifest_data = await resp.json()
-                        print(f"✅ Loaded {len(manifest_data)} chapters.")
-                        return
-                    else:
-                        print(f"⚠️ Manifest fetch failed with status {resp.status}")
+            headers = {}
+            if len(current) and not force:
+                if current.meta.get('etag'):
+                    headers['If-None-Match'] = current.meta['etag']
+                if current.meta.get('last_modified'):
+                    headers['If-Modified-Since'] = current.meta['last_modified']
+            started = time.perf_counter()
+            async with http_client.get(MANIFEST_URL, headers=headers) as resp:
+                if resp.status == 304:
+                    current.meta['fetched_at'] = time.time()
+                    summary = f"Manifest v{current.version} unchanged ({len(current)} chapters)."
+                    print(f"✅ {summary}")
+                    # So a restart (or another worker) sees the cache as fresh too
+                    await loop.run_in_executor(None, save_manifest_meta, dict(current.meta))
+                    return summary
+                elif resp.status == 200:
+                    raw = await resp.read()
+                    meta = {
+                        'etag': resp.headers.get('ETag'),
+                        'last_modified': resp.headers.get('Last-Modified'),
+                        'fetched_at': time.time(),
+                    }
+                    downloaded = time.perf_counter()
+                    snapshot = await loop.run_in_executor(None, build_manifest_snapshot, raw, meta)
+                    added, removed, changed = await loop.run_in_executor(None, diff_manifests, current, snapshot)
+                    built = time.perf_counter()
+                    install_manifest(snapshot)
+                    summary = (f"Manifest v{snapshot.version}: {len(snapshot)} chapters "
+                               f"({changed} changed, {added} added, {removed} removed); "
+                               f"download {(downloaded - started) * 1000:.0f} ms, "
+                               f"parse/index/diff {(built - downloaded) * 1000:.0f} ms off-loop.")
+                    print(f"✅ {summary}")
+                    await loop.run_in_executor(None, save_manifest_snapshot, raw, meta)
+                    return summary
+                else:
+                    print(f"⚠️ Manifest fetch failed with status {resp.status}")
         except asyncio.TimeoutError:
             print(f"⏱️ Manifest fetch timeout (attempt {attempt + 1}/{max_retries})")
         except aiohttp.ClientError as e:
             print(f"🔌 Network error fetching manifest: {e}")
+        except ValueError as e:
+            print(f"⚠️ Manifest from R2 is invalid, keeping current data: {e}")
         except Exception as e:
             print(f"❌ Unexpected error fetching manifest: {e}")
         
         if attempt < max_retries - 1:
             await asyncio.sleep(2 ** attempt)  # Exponential backoff
     
-    print("❌ Failed to fetch manifest after retries")
+    if len(current):
+        print(f"❌ Failed to fetch manifest after retries, keeping {len(current)} chapters")
+    else:
+        print("❌ Failed to fetch manifest after retries")
+    return None
 
 def cleanup_voice_state(vcid):
     """Centralized cleanup for voice channel state"""
-    if vcid in voice_clients:
-        del voice_clients[vcid]
-    if vcid in playback_index:
-        del playback_index[vcid]
-    if vcid in playback_contexts:
-        del playback_contexts[vcid]
-    if vcid in active_verse_tasks:
-        try:
-            active_verse_tasks[vcid].cancel()
-        except:
-            pass
-        del active_verse_tasks[vcid]
-    if vcid in pause_state:
-        del pause_state[vcid]
-    if vcid in playback_queue:
-        del playback_queue[vcid]
-    if vcid in verse_range_playback:
-        del verse_range_playback[vcid]
+    close_session(vcid)
 
 async def ensure_voice_connection(ctx, vcid):
     """Ensure voice connection with retry logic"""
-    vc = voice_clients.get(vcid)
+    session = open_session(vcid)
+    vc = session.vc
     
     if vc and vc.is_connected():
         return vc
@@ -300,7 +1921,7 @@ async def ensure_voice_connection(ctx, vcid):
                     pass
             
             vc = await ctx.author.voice.channel.connect(timeout=10.0, reconnect=True)
-            voice_clients[vcid] = vc
+            session.vc = vc
             return vc
         except asyncio.TimeoutError:
             print(f"⏱️ Voice connection timeout (attempt {attempt + 1}/{max_retries})")
@@ -317,325 +1938,993 @@ async def ensure_voice_connection(ctx, vcid):
     raise ConnectionError("Failed to establish voice connection after retries")
 
 def get_index(book: str, chapter: int):
-    # Normalize book name for better matching
-    normalized_book = book.lower().strip()
-    
-    # Handle books with numbers (1, 2, 3 John, Peter, etc.)
-    number_words = {
-        '1': '1', '2': '2', '3': '3',
-        'one': '1', 'two': '2', 'three': '3'
-    }
-    
-    # Comprehensive book abbreviations
-    book_abbreviations = {
-        # Old Testament
-        'gen': 'genesis', 'gen.': 'genesis', 'gn': 'genesis',
-        'exo': 'exodus', 'exo.': 'exodus', 'ex': 'exodus',
-        'lev': 'leviticus', 'lev.': 'leviticus', 'lv': 'leviticus',
-        'num': 'numbers', 'num.': 'numbers', 'nm': 'numbers',
-        'deu': 'deuteronomy', 'deu.': 'deuteronomy', 'dt': 'deuteronomy',
-        'jos': 'joshua', 'jos.': 'joshua', 'js': 'joshua',
-        'jud': 'judges', 'jud.': 'judges', 'jdg': 'judges',
-        'rut': 'ruth', 'rut.': 'ruth', 'rt': 'ruth',
-        '1sam': '1 samuel', '1sam.': '1 samuel', '1sa': '1 samuel',
-        '2sam': '2 samuel', '2sam.': '2 samuel', '2sa': '2 samuel',
-        '1kin': '1 kings', '1kin.': '1 kings', '1ki': '1 kings',
-        '2kin': '2 kings', '2kin.': '2 kings', '2ki': '2 kings',
-        '1chr': '1 chronicles', '1chr.': '1 chronicles', '1ch': '1 chronicles',
-        '2chr': '2 chronicles', '2chr.': '2 chronicles', '2ch': '2 chronicles',
-        'ezr': 'ezra', 'ezr.': 'ezra',
-        'neh': 'nehemiah', 'neh.': 'nehemiah',
-        'est': 'esther', 'est.': 'esther',
-        'job': 'job',
-        'psa': 'psalms', 'psa.': 'psalms', 'ps': 'psalms',
-        'pro': 'proverbs', 'pro.': 'proverbs', 'pr': 'proverbs',
-        'ecc': 'ecclesiastes', 'ecc.': 'ecclesiastes', 'ec': 'ecclesiastes',
-        'sos': 'song of solomon', 'sos.': 'song of solomon', 'so': 'song of solomon',
-        'isa': 'isaiah', 'isa.': 'isaiah',
-        'jer': 'jeremiah', 'jer.': 'jeremiah',
-        'lam': 'lamentations', 'lam.': 'lamentations',
-        'ezk': 'ezekiel', 'ezk.': 'ezekiel',
-        'dan': 'daniel', 'dan.': 'daniel',
-        'hos': 'hosea', 'hos.': 'hosea',
-        'joe': 'joel', 'joe.': 'joel',
-        'amo': 'amos', 'amo.': 'amos',
-        'oba': 'obadiah', 'oba.': 'obadiah', 'ob': 'obadiah',
-        'jon': 'jonah', 'jon.': 'jonah',
-        'mic': 'micah', 'mic.': 'micah',
-        'nah': 'nahum', 'nah.': 'nahum',
-        'hab': 'habakkuk', 'hab.': 'habakkuk',
-        'zep': 'zephaniah', 'zep.': 'zephaniah',
-        'hag': 'haggai', 'hag.': 'haggai',
-        'zec': 'zechariah', 'zec.': 'zechariah',
-        'mal': 'malachi', 'mal.': 'malachi',
-        
-        # New Testament
-        'mat': 'matthew', 'mat.': 'matthew', 'mt': 'matthew',
-        'mar': 'mark', 'mar.': 'mark', 'mk': 'mark',
-        'luk': 'luke', 'luk.': 'luke', 'lk': 'luke',
-        'joh': 'john', 'joh.': 'john', 'jn': 'john',
-        'act': 'acts', 'act.': 'acts', 'ac': 'acts',
-        'rom': 'romans', 'rom.': 'romans', 'ro': 'romans',
-        '1co': '1 corinthians', '1co.': '1 corinthians',
-        '2co': '2 corinthians', '2co.': '2 corinthians',
-        'gal': 'galatians', 'gal.': 'galatians',
-        'eph': 'ephesians', 'eph.': 'ephesians',
-        'phi': 'philippians', 'phi.': 'philippians', 'ph': 'philippians',
-        'col': 'colossians', 'col.': 'colossians',
-        '1th': '1 thessalonians', '1th.': '1 thessalonians',
-        '2th': '2 thessalonians', '2th.': '2 thessalonians',
-        '1ti': '1 timothy', '1ti.': '1 timothy',
-        '2ti': '2 timothy', '2ti.': '2 timothy',
-        'tit': 'titus', 'tit.': 'titus',
-        'phm': 'philemon', 'phm.': 'philemon', 'phm': 'philemon',
-        'heb': 'hebrews', 'heb.': 'hebrews',
-        'jam': 'james', 'jam.': 'james', 'jas': 'james',
-        '1pe': '1 peter', '1pe.': '1 peter',
-        '2pe': '2 peter', '2pe.': '2 peter',
-        '1jo': '1 john', '1jo.': '1 john',
-        '2jo': '2 john', '2jo.': '2 john',
-        '3jo': '3 john', '3jo.': '3 john',
-        'jud': 'jude', 'jud.': 'jude',
-        'rev': 'revelation', 'rev.': 'revelation',
-        
-        # Common short abbreviations
-        'pet': 'peter', 'pet.': 'peter',
-        'john': 'john', 'john.': 'john',
-        'matt': 'matthew', 'matt.': 'matthew',
-        'mark': 'mark', 'mark.': 'mark',
-        'luke': 'luke', 'luke.': 'luke',
-        'acts': 'acts', 'acts.': 'acts',
-        'rom': 'romans', 'rom.': 'romans',
-        'cor': 'corinthians', 'cor.': 'corinthians',
-        'gal': 'galatians', 'gal.': 'galatians',
-        'eph': 'ephesians', 'eph.': 'ephesians',
-        'phi': 'philippians', 'phi.': 'philippians',
-        'col': 'colossians', 'col.': 'colossians',
-        'thess': 'thessalonians', 'thess.': 'thessalonians',
-        'tim': 'timothy', 'tim.': 'timothy',
-        'tit': 'titus', 'tit.': 'titus',
-        'heb': 'hebrews', 'heb.': 'hebrews',
-        'jam': 'james', 'jam.': 'james',
-        'jude': 'jude', 'jude.': 'jude',
-        'rev': 'revelation', 'rev.': 'revelation'
-    }
-    
-    # Check if the book is an abbreviation first
-    if normalized_book in book_abbreviations:
-        normalized_book = book_abbreviations[normalized_book]
-    
-    # Try exact match first
-    for i, entry in enumerate(manifest_data):
-        if entry['book'].lower() == normalized_book and int(entry['chapter']) == int(chapter):
-            return i
-    
-    # Try fuzzy matching for books with numbers
-    book_parts = normalized_book.split()
-    
-    if len(book_parts) >= 2:
-        # Check if first part is a number
-        first_part = book_parts[0]
-        
-        if first_part in number_words:
-            number = number_words[first_part]
-            remaining_parts = book_parts[1:]
-            
-            # Try "X Bookname" format
-            for i, entry in enumerate(manifest_data):
-                entry_book = entry['book'].lower()
-                
-                # Check if it starts with the number
-                if entry_book.startswith(number + ' '):
-                    book_part = entry_book[len(number) + 1:].strip()
-                    expected_book = ' '.join(remaining_parts).strip()
-                    
-                    # Try exact match
-                    if book_part == expected_book:
-                        if int(entry['chapter']) == int(chapter):
-                            return i
-                    
-                    # Try partial match (in case of extra words or slight differences)
-                    elif expected_book in book_part or book_part in expected_book:
-                        if int(entry['chapter']) == int(chapter):
-                            return i
-            
-            # Try "Bookname X" format (like "Peter 2")
-            for i, entry in enumerate(manifest_data):
-                entry_book = entry['book'].lower()
-                entry_parts = entry_book.split()
-                if len(entry_parts) >= 2 and entry_parts[-1] == number:
-                    book_name = ' '.join(entry_parts[:-1])
-                    expected_book = ' '.join(remaining_parts)
-                    
-                    if (book_name == expected_book or 
-                        expected_book in book_name or 
-                        book_name in expected_book):
-                        if int(entry['chapter']) == int(chapter):
-                            return i
-    
-    # Try removing spaces and punctuation for compact formats
-    compact_normalized = normalized_book.replace(' ', '').replace('.', '')
-    for i, entry in enumerate(manifest_data):
-        entry_compact = entry['book'].lower().replace(' ', '').replace('.', '')
-        if entry_compact == compact_normalized and int(entry['chapter']) == int(chapter):
-            return i
-    
+    """Resolve a book alias + chapter to an index into the current manifest snapshot"""
+    started = time.perf_counter()
+    index = manifest_for().index
+    found = index.lookup(book, chapter) if index is not None else None
+    get_index_seconds.observe(time.perf_counter() - started)
+    return found
+
+# === MANIFEST INDEX ===
+# Handle books with numbers (1, 2, 3 John, Peter, etc.)
+NUMBER_WORDS = {
+    '1': '1', '2': '2', '3': '3',
+    'one': '1', 'two': '2', 'three': '3',
+    'first': '1', 'second': '2', 'third': '3',
+    'i': '1', 'ii': '2', 'iii': '3'
+}
+
+# Comprehensive book abbreviations
+BOOK_ABBREVIATIONS = {
+    # Old Testament
+    'gen': 'genesis', 'gen.': 'genesis', 'gn': 'genesis',
+    'exo': 'exodus', 'exo.': 'exodus', 'ex': 'exodus',
+    'lev': 'leviticus', 'lev.': 'leviticus', 'lv': 'leviticus',
+    'num': 'numbers', 'num.': 'numbers', 'nm': 'numbers',
+    'deu': 'deuteronomy', 'deu.': 'deuteronomy', 'dt': 'deuteronomy',
+    'jos': 'joshua', 'jos.': 'joshua', 'js': 'joshua',
+    'jud': 'judges', 'jud.': 'judges', 'jdg': 'judges',
+    'rut': 'ruth', 'rut.': 'ruth', 'rt': 'ruth',
+    '1sam': '1 samuel', '1sam.': '1 samuel', '1sa': '1 samuel',
+    '2sam': '2 samuel', '2sam.': '2 samuel', '2sa': '2 samuel',
+    '1kin': '1 kings', '1kin.': '1 kings', '1ki': '1 kings',
+    '2kin': '2 kings', '2kin.': '2 kings', '2ki': '2 kings',
+    '1chr': '1 chronicles', '1chr.': '1 chronicles', '1ch': '1 chronicles',
+    '2chr': '2 chronicles', '2chr.': '2 chronicles', '2ch': '2 chronicles',
+    'ezr': 'ezra', 'ezr.': 'ezra',
+    'neh': 'nehemiah', 'neh.': 'nehemiah',
+    'est': 'esther', 'est.': 'esther',
+    'job': 'job',
+    'psa': 'psalms', 'psa.': 'psalms', 'ps': 'psalms',
+    'pro': 'proverbs', 'pro.': 'proverbs', 'pr': 'proverbs',
+    'ecc': 'ecclesiastes', 'ecc.': 'ecclesiastes', 'ec': 'ecclesiastes',
+    'sos': 'song of solomon', 'sos.': 'song of solomon', 'so': 'song of solomon',
+    'isa': 'isaiah', 'isa.': 'isaiah',
+    'jer': 'jeremiah', 'jer.': 'jeremiah',
+    'lam': 'lamentations', 'lam.': 'lamentations',
+    'ezk': 'ezekiel', 'ezk.': 'ezekiel',
+    'dan': 'daniel', 'dan.': 'daniel',
+    'hos': 'hosea', 'hos.': 'hosea',
+    'joe': 'joel', 'joe.': 'joel',
+    'amo': 'amos', 'amo.': 'amos',
+    'oba': 'obadiah', 'oba.': 'obadiah', 'ob': 'obadiah',
+    'jon': 'jonah', 'jon.': 'jonah',
+    'mic': 'micah', 'mic.': 'micah',
+    'nah': 'nahum', 'nah.': 'nahum',
+    'hab': 'habakkuk', 'hab.': 'habakkuk',
+    'zep': 'zephaniah', 'zep.': 'zephaniah',
+    'hag': 'haggai', 'hag.': 'haggai',
+    'zec': 'zechariah', 'zec.': 'zechariah',
+    'mal': 'malachi', 'mal.': 'malachi',
+
+    # New Testament
+    'mat': 'matthew', 'mat.': 'matthew', 'mt': 'matthew',
+    'mar': 'mark', 'mar.': 'mark', 'mk': 'mark',
+    'luk': 'luke', 'luk.': 'luke', 'lk': 'luke',
+    'joh': 'john', 'joh.': 'john', 'jn': 'john',
+    'act': 'acts', 'act.': 'acts', 'ac': 'acts',
+    'rom': 'romans', 'rom.': 'romans', 'ro': 'romans',
+    '1co': '1 corinthians', '1co.': '1 corinthians',
+    '2co': '2 corinthians', '2co.': '2 corinthians',
+    'gal': 'galatians', 'gal.': 'galatians',
+    'eph': 'ephesians', 'eph.': 'ephesians',
+    'phi': 'philippians', 'phi.': 'philippians', 'ph': 'philippians',
+    'col': 'colossians', 'col.': 'colossians',
+    '1th': '1 thessalonians', '1th.': '1 thessalonians',
+    '2th': '2 thessalonians', '2th.': '2 thessalonians',
+    '1ti': '1 timothy', '1ti.': '1 timothy',
+    '2ti': '2 timothy', '2ti.': '2 timothy',
+    'tit': 'titus', 'tit.': 'titus',
+    'phm': 'philemon', 'phm.': 'philemon', 'phm': 'philemon',
+    'heb': 'hebrews', 'heb.': 'hebrews',
+    'jam': 'james', 'jam.': 'james', 'jas': 'james',
+    '1pe': '1 peter', '1pe.': '1 peter',
+    '2pe': '2 peter', '2pe.': '2 peter',
+    '1jo': '1 john', '1jo.': '1 john',
+    '2jo': '2 john', '2jo.': '2 john',
+    '3jo': '3 john', '3jo.': '3 john',
+    'jud': 'jude', 'jud.': 'jude',
+    'rev': 'revelation', 'rev.': 'revelation',
+
+    # Common short abbreviations
+    'pet': 'peter', 'pet.': 'peter',
+    'john': 'john', 'john.': 'john',
+    'matt': 'matthew', 'matt.': 'matthew',
+    'mark': 'mark', 'mark.': 'mark',
+    'luke': 'luke', 'luke.': 'luke',
+    'acts': 'acts', 'acts.': 'acts',
+    'rom': 'romans', 'rom.': 'romans',
+    'cor': 'corinthians', 'cor.': 'corinthians',
+    'gal': 'galatians', 'gal.': 'galatians',
+    'eph': 'ephesians', 'eph.': 'ephesians',
+    'phi': 'philippians', 'phi.': 'philippians',
+    'col': 'colossians', 'col.': 'colossians',
+    'thess': 'thessalonians', 'thess.': 'thessalonians',
+    'tim': 'timothy', 'tim.': 'timothy',
+    'tit': 'titus', 'tit.': 'titus',
+    'heb': 'hebrews', 'heb.': 'hebrews',
+    'jam': 'james', 'jam.': 'james',
+    'jude': 'jude', 'jude.': 'jude',
+    'rev': 'revelation', 'rev.': 'revelation'
+}
+
+NUMBERED_BOOK_RE = re.compile(r'^([123])\s*(.+)$')
+
+def normalize_book_key(name):
+    """Lowercase, drop dots and collapse whitespace: "1 Cor." -> "1 cor" """
+    return ' '.join(name.lower().replace('.', ' ').split())
+
+class ManifestIndex:
+    """
+    Book/chapter lookup built once per manifest load. Every accepted spelling of every
+    book ("1 John", "1john", "1jn", "First John", "john 1", ...) is expanded up front,
+    so a lookup is two dict hits.
+    """
+    def __init__(self, manifest):
+        self.chapters = {}  # {(book_key, chapter): manifest index}
+        self.aliases = {}   # {alias: book_key}
+        self.book_chapters = {}  # {book name as in the manifest: sorted chapter numbers}
+        books = []
+        for i, entry in enumerate(manifest):
+            book_key = entry.book.lower()
+            if book_key not in self.aliases:
+                books.append(book_key)
+                self.aliases[book_key] = book_key
+            # First entry wins, matching the order the old linear scan returned
+            self.chapters.setdefault((book_key, entry.chapter), i)
+            self.book_chapters.setdefault(entry.book, set()).add(entry.chapter)
+        for book, chapters in self.book_chapters.items():
+            self.book_chapters[book] = sorted(chapters)
+
+        # Priority: exact names, then their compact forms, then explicit abbreviations,
+        # then generated numbered-book spellings, then their prefixes. setdefault keeps the first claim.
+        for book_key in books:
+            self._add(normalize_book_key(book_key), book_key)
+            self._add(book_key.replace(' ', '').replace('.', ''), book_key)
+        for abbr, target in BOOK_ABBREVIATIONS.items():
+            if target in self.aliases and self.aliases[target] == target:
+                self._add(abbr, target)
+                self._add(normalize_book_key(abbr), target)
+        for book_key in books:
+            match = NUMBERED_BOOK_RE.match(book_key)
+            if match:
+                self._add_numbered(book_key, match.group(1), match.group(2))
+        # Last, so a prefix never takes a spelling some book already claimed
+        for book_key in books:
+            match = NUMBERED_BOOK_RE.match(book_key)
+            if match:
+                self._add_numbered_prefixes(book_key, match.group(1), match.group(2))
+
+    def _add(self, alias, book_key):
+        if alias:
+            self.aliases.setdefault(alias, book_key)
+
+    def _add_numbered(self, book_key, number, base):
+        base_aliases = {base, base.replace(' ', '')}
+        for abbr, target in BOOK_ABBREVIATIONS.items():
+            abbr = normalize_book_key(abbr)
+            if target == base:
+                base_aliases.add(abbr)
+            elif target == book_key and abbr.startswith(number):
+                base_aliases.add(abbr[len(number):].strip())  # "1sam" -> "sam"
+        base_aliases.discard('')
+        number_forms = [word for word, digit in NUMBER_WORDS.items() if digit == number]
+        for b in base_aliases:
+            for n in number_forms:
+                self._add(f"{n} {b}", book_key)
+                self._add(f"{n}{b}", book_key)
+            self._add(f"{b} {number}", book_key)  # "Peter 2" style
+
+    def _add_numbered_prefixes(self, book_key, number, base):
+        """Shortened names ("1 chron", "2 thessa") that the old linear scan matched as prefixes"""
+        number_forms = [word for word, digit in NUMBER_WORDS.items() if digit == number]
+        for end in range(3, len(base)):
+            for n in number_forms:
+                self._add(f"{n} {base[:end]}", book_key)
+                self._add(f"{n}{base[:end]}", book_key)
+
+    def lookup(self, book, chapter):
+        book_key = self.aliases.get(book.lower().strip())
+        if book_key is None:
+            book_key = self.aliases.get(normalize_book_key(book))
+            if book_key is None:
+                return None
+        try:
+            return self.chapters.get((book_key, int(chapter)))
+        except (TypeError, ValueError):
+            return None
+
+# === MANIFEST RELOAD ===
+class ManifestSnapshot:
+    """
+    Everything derived from one manifest download: the compact chapters, their lookup
+    index and the HTTP validators. Built off the event loop and published with a single
+    assignment, so a reader never sees chapters from one version and an index from another.
+    """
+    __slots__ = ('chapters', 'index', 'meta', 'version')
+
+    def __init__(self, chapters, index, meta, version=0):
+        self.chapters = chapters
+        self.index = index
+        self.meta = meta
+        self.version = version  # Assigned by install_manifest
+
+    def __len__(self):
+        return len(self.chapters)
+
+EMPTY_MANIFEST = ManifestSnapshot([], None, {})
+manifest_reload_lock = asyncio.Lock()
+
+def build_manifest_snapshot(raw, meta):
+    """Parse, compact and index raw manifest bytes (blocking; run in an executor)"""
+    chapters = parse_manifest(raw)
+    return ManifestSnapshot(chapters, ManifestIndex(chapters), meta)
+
+def diff_manifests(old, new):
+    """(added, removed, changed) chapter counts between two snapshots (blocking)"""
+    before = {(c.book, c.chapter): c for c in old.chapters}
+    added = changed = 0
+    for c in new.chapters:
+        prev = before.pop((c.book, c.chapter), None)
+        if prev is None:
+            added += 1
+        elif prev.signature() != c.signature():
+            changed += 1
+    return added, len(before), changed
+
+def install_manifest(snapshot):
+    """
+    Make snapshot the one new lookups use. Items already playing or queued hold their own
+    snapshot reference and finish on the version they started with.
+    """
+    global manifest_snapshot
+    snapshot.version = manifest_for().version + 1
+    manifest_snapshot = snapshot
+    get_panel_layout()  # Rebuild panel options now rather than in the first dropdown click
+
+def manifest_for(vcid=None):
+    """Snapshot a voice channel is playing from, else the current one"""
+    session = sessions.get(vcid)
+    if session is not None and session.manifest is not None:
+        return session.manifest
+    return manifest_snapshot or EMPTY_MANIFEST
+
+async def refresh_manifest_periodically():
+    """Background conditional refresh; a 304 costs one small request"""
+    while True:
+        await asyncio.sleep(MANIFEST_REFRESH_MINUTES * 60)
+        try:
+            await fetch_manifest()
+        except Exception as e:
+            print(f"❌ Manifest refresh error: {e}")
+
+# === STREAMER ===
+def verse_progress_bar(current, total, width=18):
+    filled = round(current / total * width)
+    return '█' * filled + '░' * (width - filled)
+
+def build_verse_embed(view, current_idx):
+    """Embed for a VerseRangeView with its current_idx-th verse highlighted"""
+    total = len(view)
+    lines = []
+    window_start = max(0, current_idx - 2)
+    window_end   = min(total, current_idx + 5)
+
+    for i in range(window_start, window_end):
+        text = view.text(i)
+        num  = view.verse(i)
+        if i == current_idx:
+            lines.append(f'▶  **{num}.** {text}')
+        elif i < current_idx:
+            lines.append(f'*{num}. {text}*')
+        else:
+            lines.append(f'{num}. {text}')
+
+    v_cur  = view.verse(current_idx)
+    v_last = view.verse(total - 1)
+    bar    = verse_progress_bar(current_idx + 1, total)
+    footer = f'{bar}  ·  Verse {v_cur} of {v_last}'
+
+    embed = discord.Embed(
+        description='\n\n'.join(lines),
+        color=discord.Color.from_rgb(106, 90, 205)
+    )
+    embed.set_author(name=f'📖 {view.label}')
+    embed.set_footer(text=footer)
+    return embed
+
+class LeadEstimator:
+    """
+    How far ahead of the audio clock a verse edit should be sent so the ▶ marker shows up
+    as the listener hears the verse: smoothed edit delay (submit -> Discord acknowledged,
+    including time queued behind the rate limit) minus the audio delay (voice latency
+    one way plus the client's jitter buffer). Smoothing follows TCP's RTT estimator.
+    """
+    __slots__ = ('edit_avg', 'edit_dev', 'audio_delay', 'samples')
+
+    def __init__(self, edit_seed):
+        self.edit_avg = edit_seed
+        self.edit_dev = edit_seed / 2
+        self.audio_delay = VOICE_JITTER_BUFFER_SECONDS
+        self.samples = 0
+
+    def observe_edit(self, delay):
+        if not self.samples:
+            self.edit_avg = delay
+            self.edit_dev = delay / 2
+        else:
+            self.edit_dev += 0.25 * (abs(delay - self.edit_avg) - self.edit_dev)
+            self.edit_avg += 0.125 * (delay - self.edit_avg)
+        self.samples += 1
+
+    def observe_voice_latency(self, latency):
+        """vc.average_latency: voice gateway heartbeat round trip (inf until the first one)"""
+        if math.isfinite(latency):
+            self.audio_delay = latency / 2 + VOICE_JITTER_BUFFER_SECONDS
+
+    def lead(self):
+        return min(VERSE_LEAD_MAX, max(VERSE_LEAD_MIN, self.edit_avg - self.audio_delay))
+
+    def stats(self):
+        return {
+            'lead': self.lead(),
+            'edit_avg': self.edit_avg,
+            'edit_dev': self.edit_dev,
+            'audio_delay': self.audio_delay,
+            'samples': self.samples,
+        }
+
+def get_lead_estimator(vcid, channel):
+    """The voice channel's estimator, seeded from its text channel's edit history if new"""
+    session = open_session(vcid)
+    if session.lead is None:
+        editor = live_editors.get(channel.id)
+        seed = editor.stats()['latency_avg'] if editor else 0.0
+        session.lead = LeadEstimator(seed or VERSE_LEAD_DEFAULT)
+    return session.lead
+
+class VerseStream:
+    """
+    Live verse display for one voice channel. It has no task of its own: the shared
+    verse_scheduler calls fire() when the next verse boundary is due.
+    """
+    __slots__ = ('vcid', 'channel', 'view', 'source', 'lead', 'next_idx', 'generation', 'finished')
+
+    def __init__(self, vcid, channel, view, source):
+        self.vcid = vcid
+        self.channel = channel
+        self.view = view  # VerseRangeView in the same time base as source.position()
+        self.source = source
+        self.lead = get_lead_estimator(vcid, channel)
+        self.next_idx = 0
+        self.generation = 0   # Bumped on every re-arm so stale heap entries are ignored
+        self.finished = False
+
+    def cancel(self):
+        self.finished = True
+        self.generation += 1
+        editor = live_editors.get(self.channel.id)
+        if editor:
+            editor.close(self)
+
+    def cancelled(self):
+        return self.finished
+
+    def seconds_until_next(self):
+        """Audio time until the next verse edit is due, or None if nothing is pending"""
+        if self.finished or self.next_idx >= len(self.view):
+            return None
+        return self.view.start(self.next_idx) - self.lead.lead() - self.source.position()
+
+    def edit_completed(self, delay):
+        """Called by the LiveEmbedEditor with submit -> acknowledged time for our embed"""
+        self.lead.observe_edit(delay)
+
+    def fire(self):
+        session = sessions.get(self.vcid)
+        vc = session.vc if session else None
+        if not vc or not vc.is_connected():
+            self.cancel()
+            return
+
+        self.lead.observe_voice_latency(vc.average_latency)
+        # Where the listener will be by the time this edit shows up
+        position = self.source.position() + self.lead.lead()
+        if self.view.start(self.next_idx) > position:
+            # Audio stalled or was paused since we armed; try again from the real clock
+            verse_scheduler.arm(self)
+            return
+
+        # Catch up to the latest verse that has started rather than replaying every edit
+        idx = max(self.next_idx, self.view.index_at(position))
+        self.next_idx = idx + 1
+
+        embed = build_verse_embed(self.view, idx)
+        get_live_editor(self.channel).submit(self, embed)
+        verse_scheduler.arm(self)
+
+class EmbedSlot:
+    """One live message owned by a VerseStream, plus the newest embed waiting to be shown"""
+    __slots__ = ('message', 'pending', 'submitted_at')
+
+    def __init__(self):
+        self.message = None       # single message we keep editing
+        self.pending = None
+        self.submitted_at = 0.0
+
+class LiveEmbedEditor:
+    """
+    Per-text-channel edit pipeline for live verse embeds. Only the newest pending embed
+    per message is kept (superseded ones are dropped, not queued), and edits wait out
+    the channel's rate-limit bucket instead of running into 429s.
+    """
+    def __init__(self, channel):
+        self.channel = channel
+        self.slots = {}       # {owner: EmbedSlot}
+        self.ready = deque()  # Owners with a pending embed, in submit order
+        self.worker = None
+        self.remaining = None  # From X-RateLimit-Remaining on our last edit
+        self.reset_at = 0.0    # Loop time when the bucket refills (X-RateLimit-Reset-After)
+        self.edits = 0
+        self.sends = 0
+        self.dropped = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    def submit(self, owner, embed):
+        slot = self.slots.get(owner)
+        if slot is None:
+            slot = self.slots[owner] = EmbedSlot()
+        if slot.pending is not None:
+            self.dropped += 1
+        else:
+            self.ready.append(owner)
+        slot.submitted_at = time.perf_counter()  # Of the embed that will actually be shown
+        slot.pending = embed
+        if self.worker is None:
+            self.worker = asyncio.create_task(self._run())
+
+    def close(self, owner):
+        """Forget owner's message; anything still pending for it is discarded"""
+        self.slots.pop(owner, None)
+        if not self.slots and self.worker is None:
+            retire_live_editor(self)
+
+    def update_bucket(self, remaining, reset_after):
+        self.remaining = remaining
+        self.reset_at = asyncio.get_running_loop().time() + reset_after
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self.ready:
+                owner = self.ready.popleft()
+                slot = self.slots.get(owner)
+                if slot is None or slot.pending is None:
+                    continue
+                if slot.message is not None and self.remaining == 0:
+                    delay = self.reset_at - loop.time()
+                    if delay > 0:
+                        # Newer embeds keep replacing slot.pending while we wait
+                        self.ready.appendleft(owner)
+                        await asyncio.sleep(delay)
+                        self.remaining = None
+                        continue
+                embed, slot.pending = slot.pending, None
+                submitted_at = slot.submitted_at
+                started = time.perf_counter()
+                try:
+                    if slot.message is None:
+                        slot.message = await self.channel.send(embed=embed)
+                        self.sends += 1
+                    else:
+                        await slot.message.edit(embed=embed)
+                        self.edits += 1
+                except discord.NotFound:
+                    # Someone deleted the live message; post a fresh one
+                    slot.message = await self.channel.send(embed=embed)
+                    self.sends += 1
+                except discord.HTTPException as e:
+                    self.failures += 1
+                    print(f"⚠️ Live embed update failed in channel {self.channel.id}: {e}")
+                    continue
+                finished = time.perf_counter()
+                owner.edit_completed(finished - submitted_at)
+                latency = finished - started
+                self.latency_total += latency
+                self.latency_last = latency
+                self.latency_max = max(self.latency_max, latency)
+                embed_edit_seconds.observe(latency)
+        except Exception as e:
+            print(f"❌ Live embed editor error in channel {self.channel.id}: {e}")
+            traceback.print_exc()
+        finally:
+            self.worker = None
+            if not self.slots:
+                retire_live_editor(self)
+
+    def stats(self):
+        completed = self.edits + self.sends
+        return {
+            'edits': self.edits,
+            'sends': self.sends,
+            'dropped': self.dropped,
+            'failures': self.failures,
+            'rate_limited': self.rate_limited,
+            'latency_avg': self.latency_total / completed if completed else 0.0,
+            'latency_last': self.latency_last,
+            'latency_max': self.latency_max,
+        }
+
+live_editors = {}  # {text_channel_id: LiveEmbedEditor}
+# Counters from editors that went idle and were dropped, so totals survive them
+retired_edit_stats = {'edits': 0, 'sends': 0, 'dropped': 0, 'failures': 0, 'rate_limited': 0,
+                      'latency_total': 0.0, 'latency_max': 0.0}
+
+def get_live_editor(channel):
+    editor = live_editors.get(channel.id)
+    if editor is None:
+        editor = live_editors[channel.id] = LiveEmbedEditor(channel)
+    return editor
+
+def retire_live_editor(editor):
+    if live_editors.get(editor.channel.id) is not editor:
+        return
+    del live_editors[editor.channel.id]
+    for key in ('edits', 'sends', 'dropped', 'failures', 'rate_limited', 'latency_total'):
+        retired_edit_stats[key] += getattr(editor, key)
+    retired_edit_stats['latency_max'] = max(retired_edit_stats['latency_max'], editor.latency_max)
+
+def live_editor_totals():
+    """Edit pipeline counters summed over every channel, past and present"""
+    totals = dict(retired_edit_stats)
+    for editor in live_editors.values():
+        for key in ('edits', 'sends', 'dropped', 'failures', 'rate_limited', 'latency_total'):
+            totals[key] += getattr(editor, key)
+        totals['latency_max'] = max(totals['latency_max'], editor.latency_max)
+    completed = totals['edits'] + totals['sends']
+    totals['latency_avg'] = totals['latency_total'] / completed if completed else 0.0
+    return totals
+
+MESSAGE_ROUTE_RE = re.compile(r'/channels/(\d+)/messages/\d+$')
+
+async def on_discord_request_end(session, trace_ctx, params):
+    """Feed rate-limit headers from message edits into that channel's LiveEmbedEditor"""
+    if params.method != 'PATCH':
+        return
+    match = MESSAGE_ROUTE_RE.search(params.url.path)
+    if not match:
+        return
+    editor = live_editors.get(int(match.group(1)))
+    if editor is None:
+        return
+    headers = params.response.headers
+    if params.response.status == 429:
+        editor.rate_limited += 1
+    remaining = headers.get('X-RateLimit-Remaining')
+    reset_after = headers.get('X-RateLimit-Reset-After')
+    if remaining is not None and reset_after is not None:
+        try:
+            editor.update_bucket(int(remaining), float(reset_after))
+        except ValueError:
+            pass
+
+http_trace.on_request_end.append(on_discord_request_end)
+
+class VerseScheduler:
+    """
+    One timer for every channel's verse highlighting. Streams sit in a heap keyed by
+    the loop time of their next verse boundary; the loop only wakes when one is due.
+    """
+    def __init__(self):
+        self.heap = []  # [(deadline, seq, generation, stream)]
+        self.seq = 0
+        self.timer = None
+        self.timer_deadline = None
+
+    def arm(self, stream):
+        """(Re)compute stream's next deadline. Paused or finished streams are simply not queued."""
+        stream.generation += 1
+        wait = stream.seconds_until_next()
+        if wait is None:
+            return
+        session = sessions.get(stream.vcid)
+        if session and session.vc and session.vc.is_paused():
+            return  # rearm() is called again on resume
+        loop = asyncio.get_running_loop()
+        self.seq += 1
+        heapq.heappush(self.heap, (loop.time() + max(0.0, wait), self.seq, stream.generation, stream))
+        self._reschedule(loop)
+
+    def rearm(self, vcid):
+        """Call after pause, resume or seek so the deadline follows the audio clock"""
+        session = sessions.get(vcid)
+        stream = session.stream if session else None
+        if stream is not None and not stream.finished:
+            self.arm(stream)
+
+    def _reschedule(self, loop):
+        # Drop stale entries from the top so the timer targets a live deadline
+        while self.heap and self.heap[0][2] != self.heap[0][3].generation:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = self.timer_deadline = None
+            return
+        deadline = self.heap[0][0]
+        if self.timer and self.timer_deadline <= deadline:
+            return
+        if self.timer:
+            self.timer.cancel()
+        self.timer_deadline = deadline
+        self.timer = loop.call_at(deadline, self._on_timer)
+
+    def _on_timer(self):
+        loop = asyncio.get_running_loop()
+        self.timer = self.timer_deadline = None
+        now = loop.time()
+        while self.heap and self.heap[0][0] <= now:
+            _, _, generation, stream = heapq.heappop(self.heap)
+            if generation != stream.generation or stream.finished:
+                continue
+            try:
+                stream.fire()
+            except Exception as e:
+                print(f"❌ Verse stream error (vcid={stream.vcid}): {e}")
+                traceback.print_exc()
+                stream.cancel()
+        self._reschedule(loop)
+
+verse_scheduler = VerseScheduler()
+
+def stream_verses(channel, view, vcid, source):
+    """
+    Start a live embed for a VerseRangeView, in sync with the audio. Verse starts are
+    compared against source.position(), which counts frames actually delivered
+    (pauses included for free).
+    """
+    if not len(view):
+        return None
+
+    stream = VerseStream(vcid, channel, view, source)
+    verse_scheduler.arm(stream)
+    return stream
+
+# === PREFETCH ===
+class Prefetch:
+    """Warm-up state for the item that will play after the current one"""
+    __slots__ = ('task', 'item', 'source')
+
+    def __init__(self):
+        self.task = None
+        self.item = None    # Set once warm-up starts, so a skip can tell what's in flight
+        self.source = None
+
+def next_playback_item(session):
+    """The item handle_after_playback will play next, as (index, start_verse, end_verse, snapshot)"""
+    if session.stop_after:
+        return None
+    if session.queue:
+        return session.queue[0]
+    if session.plan_start is not None:
+        return None
+    snapshot = manifest_for(session.vcid)
+    next_index = session.index + 1
+    if next_index < len(snapshot):
+        return (next_index, None, None, snapshot)
     return None
 
-# === STREAMER ===
-async def stream_verses(channel, timestamps, vcid):
-    if not timestamps:
-        return
+async def prefetch_next(session, current, prefetch):
+    """Near the end of the current item, open the next item's stream and decode its first frames"""
+    while True:
+        remaining = current.remaining()
+        if remaining <= PREFETCH_LEAD_SECONDS:
+            break
+        # Re-check periodically: attach_duration may still refine current.duration
+        await asyncio.sleep(min(remaining - PREFETCH_LEAD_SECONDS, 5))
+
+    item = next_playback_item(session)
+    if item is None:
+        return
+    prefetch.item = item
+    try:
+        source = open_item_source(item, speculative=True)
+    except Exception as e:
+        print(f"⚠️ Prefetch failed for vcid={session.vcid}: {e}")
+        return
+    prefetch.source = source
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        frames = await loop.run_in_executor(None, source.prime, PREFETCH_BUFFER_FRAMES)
+    except asyncio.CancelledError:
+        source.cleanup()
+        raise
+    print(f"⏩ Prefetched next item for vcid={session.vcid}: {frames} frame(s) in {time.perf_counter() - started:.2f}s")
+
+def record_transition(session):
+    """Called right after vc.play(); logs the gap since the previous item's end of stream"""
+    eos_time, session.eos_time = session.eos_time, None
+    if eos_time is None:
+        return
+    gap = time.perf_counter() - eos_time
+    transition_stats['count'] += 1
+    transition_stats['total'] += gap
+    transition_stats['last'] = gap
+    transition_stats['max'] = max(transition_stats['max'], gap)
+    transition_gap_seconds.observe(gap)
+    print(f"⏭️ Transition for vcid={session.vcid} took {gap * 1000:.0f} ms")
+
+def schedule_prefetch(session, current):
+    discard_prefetch(session)
+    if session.broadcast:
+        return  # The next item joins a broadcast, so a private warm-up would be thrown away
+    prefetch = Prefetch()
+    prefetch.task = asyncio.create_task(prefetch_next(session, current, prefetch))
+    session.prefetch = prefetch
+
+def discard_prefetch(session):
+    prefetch, session.prefetch = session.prefetch, None
+    if prefetch is None:
+        return
+    prefetch.task.cancel()
+    if prefetch.source is not None:
+        prefetch.source.cleanup()
+
+async def take_prefetched(session, item):
+    """Return the warmed-up source for item if the prefetch matches it, otherwise None"""
+    prefetch = session.prefetch
+    if prefetch is None:
+        return None
+    if prefetch.item != item:
+        # Still waiting for the lead window, or the queue changed since warm-up began
+        discard_prefetch(session)
+        return None
+    session.prefetch = None
+    try:
+        # Warm-up may still be in progress; it's further along than a fresh start would be
+        await prefetch.task
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"⚠️ Prefetch error for vcid={session.vcid}: {e}")
+    if prefetch.source is None or prefetch.task.cancelled():
+        return None
+    clip_cache.count(item, prefetch.source)
+    return prefetch.source
+
+# === BROADCAST ===
+class Broadcast:
+    """
+    One Opus source shared by every channel playing the same audio. Packets go into a ring
+    buffer; the first subscriber to need a packet reads it from FFmpeg, the rest copy it out.
+    Each subscriber's player thread drives its own cursor, so pausing one doesn't stall others.
+    The FFmpeg read happens outside the lock, so the loop (subscribe / unsubscribe) never
+    waits on a stalled pipe; subscribers needing the same new packet wait on the condition.
+    """
+    __slots__ = ('key', 'source', 'ring', 'base', 'finished', 'closed', 'subscribers',
+                 'lock', 'packet_ready', 'reading', 'delivered', 'skipped', 'started_at')
 
-    total = len(timestamps)
-    base_start_time = time.time()
-
-    # Look up book/chapter from current playback state
-    idx = playback_index.get(vcid)
-    entry = manifest_data[idx] if idx is not None and idx < len(manifest_data) else None
-    chapter_label = f"{entry['book']} {entry['chapter']}" if entry else "Scripture"
-
-    def clean_text(raw):
-        return re.sub(r'^\d+\.\s*', '', raw.strip())
-
-    def progress_bar(current, total, width=18):
-        filled = round(current / total * width)
-        return '█' * filled + '░' * (width - filled)
-
-    def build_embed(current_idx):
-        lines = []
-        window_start = max(0, current_idx - 2)
-        window_end   = min(total, current_idx + 5)
-
-        for i in range(window_start, window_end):
-            v    = timestamps[i]
-            text = clean_text(v['text'])
-            num  = v['verse']
-            if i == current_idx:
-                lines.append(f'▶  **{num}.** {text}')
-            elif i < current_idx:
-                lines.append(f'*{num}. {text}*')
-            else:
-                lines.append(f'{num}. {text}')
-
-        v_cur  = timestamps[current_idx]['verse']
-        v_last = timestamps[-1]['verse']
-        bar    = progress_bar(current_idx + 1, total)
-        footer = f'{bar}  ·  Verse {v_cur} of {v_last}'
-
-        embed = discord.Embed(
-            description='\n\n'.join(lines),
-            color=discord.Color.from_rgb(106, 90, 205)
-        )
-        embed.set_author(name=f'📖 {chapter_label}')
-        embed.set_footer(text=footer)
-        return embed
-
-    def get_effective_elapsed():
-        current_elapsed = time.time() - base_start_time
-        pause_info = pause_state.get(vcid, {'total_pause_time': 0.0, 'pause_start_time': None})
-        current_elapsed -= pause_info['total_pause_time']
-        if pause_info['pause_start_time']:
-            current_elapsed -= (time.time() - pause_info['pause_start_time'])
-        return max(0, current_elapsed)
-
-    live_msg = None  # single message we keep editing
-
-    # Lead time to compensate for Discord message edit latency + FFmpeg buffering
-    VERSE_LEAD_TIME = 1.5  # seconds ahead of audio
-
-    for i, v in enumerate(timestamps):
-        vc = voice_clients.get(vcid)
-        if not vc or not vc.is_connected():
-            return
+    def __init__(self, key, source):
+        self.key = key
+        self.source = source
+        self.ring = deque(maxlen=int(BROADCAST_BUFFER_SECONDS / FRAME_SECONDS))
+        self.base = 0          # Packet number of ring[0]
+        self.finished = False  # Source hit end of stream; the ring still holds the tail
+        self.closed = False
+        self.subscribers = 0
+        self.lock = threading.Lock()
+        self.packet_ready = threading.Condition(self.lock)
+        self.reading = False   # A player thread is reading the next packet from the source
+        self.delivered = 0     # Packets handed to subscribers, decoded or copied
+        self.skipped = 0       # Packets subscribers lost by falling out of the ring
+        self.started_at = time.monotonic()
 
-        # Wait until this verse's timestamp (minus lead time so arrow stays in sync)
-        while True:
-            wait = v['start'] - VERSE_LEAD_TIME - get_effective_elapsed()
-            if wait <= 0:
-                break
-            await asyncio.sleep(min(wait, 0.05))
-            vc = voice_clients.get(vcid)
-            if not vc or not vc.is_connected():
+    @property
+    def head(self):
+        """Packet number the next decoded packet will get"""
+        return self.base + len(self.ring)
+
+    def packet_at(self, cursor):
+        """Return (cursor, packet); cursor moves up to the oldest kept packet if it fell behind"""
+        with self.lock:
+            while True:
+                if cursor < self.base:
+                    self.skipped += self.base - cursor
+                    cursor = self.base
+                offset = cursor - self.base
+                if offset < len(self.ring):
+                    self.delivered += 1
+                    return cursor, self.ring[offset]
+                if self.finished or self.closed:
+                    return cursor, b''
+                if not self.reading:
+                    self.reading = True
+                    break
+                self.packet_ready.wait()  # Another subscriber is reading this packet
+
+        data = b''
+        try:
+            data = self.source.read()
+        finally:
+            with self.lock:
+                self.reading = False
+                closed = self.closed
+                if not data:
+                    self.finished = True
+                elif not closed:
+                    if len(self.ring) == self.ring.maxlen:
+                        self.base += 1
+                    self.ring.append(data)
+                    self.delivered += 1
+                self.packet_ready.notify_all()
+            if closed:
+                # The last subscriber left mid-read and left the cleanup to us
+                self.source.cleanup()
+        return cursor, (b'' if closed else data)
+
+    def subscribe(self):
+        with self.lock:
+            self.subscribers += 1
+            backlog = int(BROADCAST_JOIN_BACKLOG_SECONDS / FRAME_SECONDS)
+            cursor = max(self.base, self.head - backlog)
+        return BroadcastSubscriber(self, cursor)
+
+    def unsubscribe(self, subscriber):
+        """Idempotent per subscriber; safe from the player thread and the loop at once"""
+        with self.lock:
+            if not subscriber.subscribed:
+                return
+            subscriber.subscribed = False
+            self.subscribers -= 1
+            if self.subscribers > 0 or self.closed:
                 return
+            self.closed = True
+            reading = self.reading
+            self.packet_ready.notify_all()
+        # Last listener gone: drop the registry entry (unless a newer broadcast replaced it)
+        with broadcasts_lock:
+            if broadcasts.get(self.key) is self:
+                del broadcasts[self.key]
+        if not reading:
+            self.source.cleanup()
 
-        if vcid not in active_verse_tasks or active_verse_tasks[vcid].cancelled():
-            return
+class BroadcastSubscriber(AudioSourceMixin, discord.AudioSource):
+    """A voice client's view of a Broadcast: already-encoded packets from its own cursor"""
 
-        embed = build_embed(i)
+    def __init__(self, broadcast, cursor):
+        self.broadcast = broadcast
+        self.cursor = cursor
+        self.seek_time = broadcast.source.seek_time
+        self.subscribed = True  # Cleared under broadcast.lock by unsubscribe()
 
-        if live_msg is None:
-            live_msg = await channel.send(embed=embed)
-        else:
-            try:
-                await live_msg.edit(embed=embed)
-            except (discord.NotFound, discord.HTTPException):
-                live_msg = await channel.send(embed=embed)
+    @property
+    def duration(self):
+        return self.broadcast.source.duration
+
+    @duration.setter
+    def duration(self, value):
+        self.broadcast.source.duration = value
+
+    def is_opus(self):
+        return True
+
+    def _read_frame(self):
+        cursor, data = self.broadcast.packet_at(self.cursor)
+        if data:
+            self.cursor = cursor + 1
+        return data
+
+    def position(self):
+        """Position on the broadcast's shared clock; a late joiner starts mid-chapter"""
+        return self.seek_time + self.cursor * FRAME_SECONDS
+
+    def remaining(self):
+        return self.duration - self.cursor * FRAME_SECONDS
 
+    def cleanup(self):
+        # Called by both the player thread and handle_after_playback
+        self.broadcast.unsubscribe(self)
+
+broadcasts_lock = threading.Lock()  # Player threads unsubscribe while the loop subscribes
 
+def join_broadcast(item):
+    """Subscribe to the broadcast playing item's audio, starting one if none is live"""
+    key = item_audio_bounds(item)
+    with broadcasts_lock:
+        broadcast = broadcasts.get(key)
+        if broadcast is not None and not (broadcast.finished or broadcast.closed):
+            subscriber = broadcast.subscribe()
+            if not broadcast.closed:
+                return subscriber
+        # Broadcasts always carry Opus, whatever PLAYBACK_MODE says: that's what makes sharing free
+        broadcast = Broadcast(key, create_item_source(item, mode='opus'))
+        broadcasts[key] = broadcast
+        return broadcast.subscribe()
+
+def broadcast_totals():
+    with broadcasts_lock:
+        live = list(broadcasts.values())
+    return {
+        'broadcasts': len(live),
+        'subscribers': sum(b.subscribers for b in live),
+        'decoded': sum(b.head for b in live),
+        'delivered': sum(b.delivered for b in live),
+        'skipped': sum(b.skipped for b in live),
+    }
 
 # === PLAYBACK ===
+async def source_for_item(session, item):
+    """The source to play item with: a broadcast subscription, the prefetched source, or a new one"""
+    if session.broadcast:
+        return join_broadcast(item)
+    source = await take_prefetched(session, item)
+    if source is None:
+        source = open_item_source(item)
+    return source
+
 async def handle_after_playback(error, vcid, source):
     if error:
         print(f"❌ Playback error (vcid={vcid}): {error}")
         traceback.print_exc()
     
-    # Adaptive sleep based on actual playback duration
-    actual_elapsed = source.elapsed()
-    expected_duration = getattr(source, 'duration', 10)
-    remaining = max(0.5, min(expected_duration - actual_elapsed, 10))
-    
-    await asyncio.sleep(remaining)
-    
+    # The player calls us as soon as the source reports end of stream (apad tail included),
+    # so everything below runs immediately instead of waiting on a wall-clock estimate.
     try:
         source.cleanup()
     except Exception as e:
         print(f"⚠️ Cleanup error: {e}")
+    if source.recorder is not None:
+        clip_cache.finish(source, error)
     
     # Check voice connection is still valid
-    vc = voice_clients.get(vcid)
-    if not vc or not vc.is_connected():
+    session = sessions.get(vcid)
+    if session is None or not session.connected:
         print(f"🔌 Voice connection lost for vcid={vcid}")
         cleanup_voice_state(vcid)
         return
     
     # Check if this is verse range playback that should stop
-    if vcid in verse_range_playback:
-        range_info = verse_range_playback[vcid]
-        if range_info.get('stop_after', False):
-            # Verse range completed, stop playback and clean up
-            vc = voice_clients[vcid]
-            vc.stop()
-            del verse_range_playback[vcid]
-            if vcid in active_verse_tasks:
-                active_verse_tasks[vcid].cancel()
-                del active_verse_tasks[vcid]
-            return
+    if session.stop_after:
+        # Verse range completed, stop playback and clean up
+        session.vc.stop()
+        session.stop_after = False
+        session.cancel_stream()
+        return
+    
+    # Let the next play measure how long the transition took
+    if getattr(source, 'eos_time', None) is not None:
+        session.eos_time = source.eos_time
     
     # Check if there are queued chapters to play next
-    if vcid in playback_queue and playback_queue[vcid]:
-        next_item = playback_queue[vcid].pop(0)
-        ctx = playback_contexts.get(vcid)
+    if session.queue:
+        index, start_verse, end_verse, snapshot = session.queue.pop(0)
+        ctx = session.context()
         if ctx:
-            if isinstance(next_item, tuple):
-                # Handle verse range in queue
-                index, start_verse, end_verse = next_item
-                await play_entry(ctx, index, start_verse, end_verse)
-            else:
-                # Handle regular chapter in queue
-                await play_entry(ctx, next_item)
+            await play_entry(ctx, index, start_verse, end_verse, snapshot)
         return
     
-    # Otherwise, play the next chapter from the manifest (sequential playback)
-    next_index = playback_index.get(vcid, -1) + 1
-    if next_index < len(manifest_data):
-        ctx = playback_contexts.get(vcid)
+    # A reading plan plays just the day's chapters (all queued when it started)
+    if session.plan_start is not None:
+        finish_plan_session(session)
+        return
+    
+    # Otherwise, play the next chapter from the manifest (sequential playback),
+    # staying on the manifest version this session has been playing from
+    snapshot = manifest_for(vcid)
+    next_index = session.index + 1
+    if next_index < len(snapshot):
+        ctx = session.context()
         if ctx:
-            await play_entry(ctx, next_index)
+            await play_entry(ctx, next_index, snapshot=snapshot)
 
-async def play_entry_with_verse_range(ctx, index, start_verse, end_verse):
-    """Play a specific verse range from a chapter"""
-    entry = manifest_data[index]
+async def play_entry_with_verse_range(ctx, index, start_verse, end_verse, snapshot, requested_at=None):
+    """Play a specific verse range from a chapter; requested_at times the first audio for /metrics"""
+    entry = snapshot.chapters[index]
     vcid = ctx.author.voice.channel.id
 
     try:
@@ -643,78 +2932,59 @@ async def play_entry_with_verse_range(ctx, index, start_verse, end_verse):
     except ConnectionError as e:
         return await ctx.send(f"❌ {e}")
 
+    session = open_session(vcid)
     # Check if something is already playing - if so, queue the new chapter
     if vc.is_playing() or vc.is_paused():
-        if vcid not in playback_queue:
-            playback_queue[vcid] = []
-        playback_queue[vcid].append((index, start_verse, end_verse))
-        await ctx.send(f"📝 Added to queue: **{entry['book']} {entry['chapter']}:{start_verse}-{end_verse}** (Position {len(playback_queue[vcid])})")
+        session.queue.append((index, start_verse, end_verse, snapshot))
+        await ctx.send(f"📝 Added to queue: **{entry.label}:{start_verse}-{end_verse}** (Position {len(session.queue)})")
         return
 
     if vc.is_playing():
         vc.stop()
-    if vcid in active_verse_tasks:
-        active_verse_tasks[vcid].cancel()
+    session.cancel_stream()
     
-    # Clean up pause state for new playback
-    pause_state[vcid] = {'total_pause_time': 0.0, 'pause_start_time': None}
-
-    playback_index[vcid] = index
-    playback_contexts[vcid] = ctx
+    session.index = index
+    session.manifest = snapshot
+    session.bind(ctx)
 
     # Calculate timestamps for verse range with contextual padding
-    timestamps = entry["timestamps"]
-    
-    # Get all verses in the chapter to determine bounds
-    all_verses = [t['verse'] for t in timestamps]
-    min_verse = min(all_verses)
-    max_verse = max(all_verses)
-    
-    # Extend range by one verse before and after for context
-    # Handle edge cases where we can't extend before verse 1 or after the last verse
-    audio_start_verse = max(start_verse - 1, min_verse)  # One verse before, but not before chapter start
-    audio_end_verse = min(end_verse + 1, max_verse)      # One verse after, but not after chapter end
-    
-    # Calculate actual timing for the extended audio range
-    start_time = get_verse_start_time(timestamps, audio_start_verse)
-    end_time = get_verse_end_time(timestamps, audio_end_verse)
+    audio_start_verse, audio_end_verse, start_time, end_time = verse_range_bounds(entry, start_verse, end_verse)
     
-    # Use enhanced audio with seeking
-    source = SafeAudioWithSeek(entry["url"], seek_time=start_time, end_time=end_time)
+    # Use enhanced audio with seeking (already warmed up if it was prefetched)
+    source = await source_for_item(session, (index, start_verse, end_verse, snapshot))
+    source.requested_at = requested_at
     vc.play(source, after=lambda e: asyncio.run_coroutine_threadsafe(
         handle_after_playback(e, vcid, source), bot.loop))
+    record_transition(session)
 
-    await ctx.send(f"▶️ Now playing: **{entry['book']} {entry['chapter']}:{start_verse}-{end_verse}** (with context: {audio_start_verse}-{audio_end_verse})")
+    await ctx.send(f"▶️ Now playing: **{entry.label}:{start_verse}-{end_verse}** (with context: {audio_start_verse}-{audio_end_verse})")
 
     # Show control panel and autodelete old one
     await send_panel(ctx.channel)
     
-    # Filter timestamps for verse range display (original requested range only)
-    filtered_timestamps = [t for t in timestamps if start_verse <= t['verse'] <= end_verse]
-    
-    # Adjust timestamps so first verse starts at 0.0s (for verse range playback)
-    if filtered_timestamps:
-        first_verse_start = filtered_timestamps[0]['start']
-        for timestamp in filtered_timestamps:
-            timestamp['start'] -= first_verse_start
-    
-    task = asyncio.create_task(stream_verses(ctx.channel, filtered_timestamps, vcid))
-    active_verse_tasks[vcid] = task
+    # Only display the requested range (not the context verses).
+    # source.position() already includes the seek offset, so the view keeps chapter time.
+    stream = stream_verses(ctx.channel, entry.view(start_verse, end_verse), vcid, source)
+    if stream:
+        session.stream = stream
     
     # Track verse range playback
-    verse_range_playback[vcid] = {
-        'start_verse': start_verse,
-        'end_verse': end_verse,
-        'stop_after': True
-    }
+    session.stop_after = True
+
+    schedule_prefetch(session, source)
 
-async def play_entry(ctx, index, start_verse=None, end_verse=None):
-    """Enhanced play_entry that supports verse ranges"""
+async def play_entry(ctx, index, start_verse=None, end_verse=None, snapshot=None, requested_at=None):
+    """
+    Enhanced play_entry that supports verse ranges. index points into snapshot, which
+    defaults to the current manifest (what get_index resolved against).
+    """
+    if snapshot is None:
+        snapshot = manifest_for()
     if start_verse is not None and end_verse is not None:
-        return await play_entry_with_verse_range(ctx, index, start_verse, end_verse)
+        return await play_entry_with_verse_range(ctx, index, start_verse, end_verse, snapshot, requested_at)
     
     # Original play_entry logic for full chapter playback
-    entry = manifest_data[index]
+    entry = snapshot.chapters[index]
     vcid = ctx.author.voice.channel.id
 
     try:
@@ -722,44 +2992,49 @@ async def play_entry(ctx, index, start_verse=None, end_verse=None):
     except ConnectionError as e:
         return await ctx.send(f"❌ {e}")
 
+    session = open_session(vcid)
     # Check if something is already playing - if so, queue the new chapter
     if vc.is_playing() or vc.is_paused():
-        if vcid not in playback_queue:
-            playback_queue[vcid] = []
-        playback_queue[vcid].append(index)
-        await ctx.send(f"📝 Added to queue: **{entry['book']} {entry['chapter']}** (Position {len(playback_queue[vcid])})")
+        session.queue.append((index, None, None, snapshot))
+        await ctx.send(f"📝 Added to queue: **{entry.label}** (Position {len(session.queue)})")
         return
 
     if vc.is_playing():
         vc.stop()
-    if vcid in active_verse_tasks:
-        active_verse_tasks[vcid].cancel()
+    session.cancel_stream()
     
-    # Clean up pause state for new playback
-    pause_state[vcid] = {'total_pause_time': 0.0, 'pause_start_time': None}
+    session.index = index
+    session.manifest = snapshot
+    session.bind(ctx)
 
-    playback_index[vcid] = index
-    playback_contexts[vcid] = ctx
-
-    source = SafeAudio(entry["url"])
+    source = await source_for_item(session, (index, None, None, snapshot))
+    source.requested_at = requested_at
     vc.play(source, after=lambda e: asyncio.run_coroutine_threadsafe(
         handle_after_playback(e, vcid, source), bot.loop))
+    record_transition(session)
+    asyncio.create_task(attach_duration(source, entry.url, entry.duration))
 
-    await ctx.send(f"▶️ Now playing: **{entry['book']} {entry['chapter']}**")
+    await ctx.send(f"▶️ Now playing: **{entry.label}**")
 
     # ✅ Show control panel and autodelete old one
     await send_panel(ctx.channel)
 
-    task = asyncio.create_task(stream_verses(ctx.channel, entry["timestamps"], vcid))
-    active_verse_tasks[vcid] = task
+    stream = stream_verses(ctx.channel, entry.view(), vcid, source)
+    if stream:
+        session.stream = stream
+
+    schedule_prefetch(session, source)
 
 # === COMMANDS ===
-@bot.hybrid_command(description="Play a specific Bible chapter or verse range")
-async def play(ctx, *, args: str):
+def parse_play_args(args):
+    """
+    Split a play reference like "1 john 3:3-5" into (book, chapter, start_verse, end_verse).
+    Verses are None for a whole chapter. Raises ValueError with a user-facing message.
+    """
     # Parse the arguments manually to handle multi-word book names
     parts = args.strip().split()
     if len(parts) < 1:
-        return await ctx.send("❌ Please provide a book name and chapter or verse range.")
+        raise ValueError("Please provide a book name and chapter or verse range.")
     
     # Check if last part contains verse reference (contains colon)
     last_part = parts[-1]
@@ -771,22 +3046,21 @@ async def play(ctx, *, args: str):
         # Format 1: "john 3:3-5" (chapter:verse)
         # Format 2: "john 3 3-5" (chapter verse)
         chapter_verse = last_part.split(':')
-        if len(chapter_verse) == 2:
-            try:
-                chapter = int(chapter_verse[0])
-                verse_ref = chapter_verse[1]
-                
-                # Parse verse range
-                start_verse, end_verse, specific_verses = parse_verse_reference(verse_ref)
-                if start_verse is None:
-                    return await ctx.send("❌ Invalid verse reference format. Use format like '2:13-14' or '2:13'.")
-                
-                book_parts = parts[:-1]  # Everything except the last part with verse reference
-                book = ' '.join(book_parts)
-            except (ValueError, IndexError):
-                return await ctx.send("❌ Invalid chapter or verse format.")
-        else:
-            return await ctx.send("❌ Invalid verse reference format.")
+        if len(chapter_verse) != 2:
+            raise ValueError("Invalid verse reference format.")
+        try:
+            chapter = int(chapter_verse[0])
+            verse_ref = chapter_verse[1]
+            
+            # Parse verse range
+            start_verse, end_verse, specific_verses = parse_verse_reference(verse_ref)
+            
+            book_parts = parts[:-1]  # Everything except the last part with verse reference
+            book = ' '.join(book_parts)
+        except (ValueError, IndexError):
+            raise ValueError("Invalid chapter or verse format.")
+        if start_verse is None:
+            raise ValueError("Invalid verse reference format. Use format like '2:13-14' or '2:13'.")
     elif len(parts) >= 3 and parts[-2].isdigit() and any(c in parts[-1] for c in '-,'):
         # Handle format: "john 3 3-5" (book chapter verse_range)
         try:
@@ -795,13 +3069,13 @@ async def play(ctx, *, args: str):
             
             # Parse verse range
             start_verse, end_verse, specific_verses = parse_verse_reference(verse_ref)
-            if start_verse is None:
-                return await ctx.send("❌ Invalid verse reference format. Use format like 'john 3 3-5'.")
             
             book_parts = parts[:-2]  # Everything except the last two parts
             book = ' '.join(book_parts)
         except (ValueError, IndexError):
-            return await ctx.send("❌ Invalid chapter or verse format.")
+            raise ValueError("Invalid chapter or verse format.")
+        if start_verse is None:
+            raise ValueError("Invalid verse reference format. Use format like 'john 3 3-5'.")
     else:
         # No verse reference, play full chapter
         try:
@@ -814,14 +3088,172 @@ async def play(ctx, *, args: str):
         
         book = ' '.join(book_parts)
     
+    return book, chapter, start_verse, end_verse
+
+@bot.hybrid_command(description="Play a specific Bible chapter or verse range")
+async def play(ctx, *, args: str):
+    requested_at = time.perf_counter()
+    try:
+        book, chapter, start_verse, end_verse = parse_play_args(args)
+    except ValueError as e:
+        return await ctx.send(f"❌ {e}")
+    
     index = get_index(book, chapter)
     if index is None:
         return await ctx.send("❌ Chapter not found.")
     
     if start_verse is not None and end_verse is not None:
-        await play_entry(ctx, index, start_verse, end_verse)
+        await play_entry(ctx, index, start_verse, end_verse, requested_at=requested_at)
     else:
-        await play_entry(ctx, index)
+        await play_entry(ctx, index, requested_at=requested_at)
+
+@bot.hybrid_command(description="Play in sync with every other channel broadcasting the same reading")
+async def broadcast(ctx, *, args: str):
+    if not ctx.author.voice or not ctx.author.voice.channel:
+        return await ctx.send("❌ Join a VC first.")
+    try:
+        book, chapter, start_verse, end_verse = parse_play_args(args)
+    except ValueError as e:
+        return await ctx.send(f"❌ {e}")
+    
+    index = get_index(book, chapter)
+    if index is None:
+        return await ctx.send("❌ Chapter not found.")
+    
+    # Everything this channel plays from now on (queue and following chapters included)
+    # shares a decoder with any other channel at the same point; !stop leaves broadcast mode
+    session = open_session(ctx.author.voice.channel.id)
+    session.broadcast = True
+    discard_prefetch(session)
+    await play_entry(ctx, index, start_verse, end_verse)
+
+@bot.hybrid_command(description="Show playback diagnostics")
+@commands.is_owner()
+async def stats(ctx):
+    cache = audio_cache.stats()
+    embed = discord.Embed(title="📊 Bot Stats", color=discord.Color.blue())
+    embed.add_field(
+        name="Audio cache",
+        value=(f"{cache['files']} file(s), {cache['bytes'] / 1048576:.1f} / {cache['max_bytes'] / 1048576:.0f} MB\n"
+               f"Hits {cache['hits']} · Misses {cache['misses']} · Hit rate {cache['hit_rate']:.0%}\n"
+               f"Fills {cache['fills']} · Errors {cache['fill_errors']} · Evictions {cache['evictions']}"),
+        inline=False
+    )
+    clips = clip_cache.stats()
+    embed.add_field(
+        name="Clip cache",
+        value=(f"{clips['clips']} clip(s), {clips['bytes'] / 1048576:.1f} / {clips['max_bytes'] / 1048576:.0f} MB · "
+               f"{clips['tracked']} range(s) tracked\n"
+               f"Hits {clips['hits']} · Misses {clips['misses']} · Hit rate {clips['hit_rate']:.0%} · "
+               f"Recorded {clips['recorded']} · Evictions {clips['evictions']}"),
+        inline=False
+    )
+    seeks = seek_indexes.stats()
+    embed.add_field(
+        name="Seek index",
+        value=(f"{seeks['in_memory']} in memory · {seeks['building']} building · "
+               f"built {seeks['builds']} · errors {seeks['build_errors']} · not Ogg {seeks['unindexable']}\n"
+               f"Ranged seeks {seeks['ranged_plays']} · Unindexed seeks {seeks['unindexed_plays']}"),
+        inline=False
+    )
+    count = transition_stats['count']
+    avg_ms = transition_stats['total'] / count * 1000 if count else 0.0
+    embed.add_field(
+        name="Transitions",
+        value=(f"{count} · avg {avg_ms:.0f} ms · last {transition_stats['last'] * 1000:.0f} ms · "
+               f"max {transition_stats['max'] * 1000:.0f} ms"),
+        inline=False
+    )
+    edits = live_editor_totals()
+    embed.add_field(
+        name="Live verse embeds",
+        value=(f"Edits {edits['edits']} · Sends {edits['sends']} · Dropped {edits['dropped']} · "
+               f"429s {edits['rate_limited']} · Failures {edits['failures']}\n"
+               f"Latency avg {edits['latency_avg'] * 1000:.0f} ms · max {edits['latency_max'] * 1000:.0f} ms"),
+        inline=False
+    )
+    pool = http_client.stats()
+    embed.add_field(
+        name="HTTP pool",
+        value=(f"Requests {pool['requests']} · Errors {pool['errors']}\n"
+               f"Connections new {pool['created']} · reused {pool['reused']} · reuse rate {pool['reuse_rate']:.0%}\n"
+               f"Open {pool['in_use']} in use / {pool['idle']} idle (limit {pool['limit']}, {pool['limit_per_host']} per host) · "
+               f"DNS lookups {pool['dns_lookups']} · cache hits {pool['dns_cache_hits']}"),
+        inline=False
+    )
+    current = manifest_for()
+    pinned = sum(1 for session in sessions.values() if session.manifest not in (None, current))
+    age = time.time() - current.meta.get('fetched_at', time.time())
+    embed.add_field(
+        name="Manifest",
+        value=(f"v{current.version} · {len(current)} chapters · checked {age / 60:.0f} min ago\n"
+               f"{pinned} session(s) still on an older version"),
+        inline=False
+    )
+    casts = broadcast_totals()
+    fan_out = casts['delivered'] / casts['decoded'] if casts['decoded'] else 0.0
+    embed.add_field(
+        name="Broadcasts",
+        value=(f"{casts['broadcasts']} live · {casts['subscribers']} subscriber(s) · {sum(1 for session in sessions.values() if session.broadcast)} channel(s) in broadcast mode\n"
+               f"Packets decoded {casts['decoded']} · delivered {casts['delivered']} (×{fan_out:.1f}) · skipped {casts['skipped']}"),
+        inline=False
+    )
+    owned = sum(1 for plan in reading_plans.values() if bot.get_guild(plan.guild_id) is not None)
+    embed.add_field(
+        name="Reading plans",
+        value=(f"{owned} plan(s) here ({len(reading_plans)} known) · {len(plan_tasks)} ramp-up(s) running · "
+               f"{sum(1 for session in sessions.values() if session.plan_start is not None)} session(s)\n"
+               f"Started {plan_stats['started']} · skipped {plan_stats['skipped']} · "
+               f"connect failures {plan_stats['connect_failures']}"),
+        inline=False
+    )
+    live = session_stats()
+    embed.add_field(
+        name="Sessions",
+        value=(f"{live['sessions']} · {live['connected']} connected · {live['stale']} stale · "
+               f"oldest {live['oldest'] / 60:.0f} min\n"
+               f"~{live['bytes'] / 1024:.1f} KB total · {live['avg_bytes']:.0f} B each"),
+        inline=False
+    )
+    leads = []
+    streams = [session.stream for session in sessions.values() if session.stream is not None]
+    for stream in streams[:10]:
+        est = stream.lead.stats()
+        leads.append(f"<#{stream.vcid}> lead {est['lead'] * 1000:.0f} ms · edit {est['edit_avg'] * 1000:.0f} "
+                     f"±{est['edit_dev'] * 1000:.0f} ms ({est['samples']}) · audio {est['audio_delay'] * 1000:.0f} ms")
+    embed.add_field(name="Verse lead", value="\n".join(leads) or "No live verse streams", inline=False)
+    embed.add_field(
+        name="Reaper",
+        value=(f"{reaper_stats['passes']} pass(es) · voice {reaper_stats['voice']} · sessions {reaper_stats['sessions']} · "
+               f"FFmpeg {reaper_stats['ffmpeg']} · temp files {reaper_stats['temp_files']} "
+               f"({reaper_stats['temp_bytes'] / 1048576:.1f} MB) · panels {reaper_stats['panels']}"),
+        inline=False
+    )
+    await ctx.send(embed=embed)
+
+@bot.hybrid_command(name="sessions", description="List playback sessions and what they hold")
+@commands.is_owner()
+async def list_sessions(ctx):
+    lines = []
+    for session in list(sessions.values())[:20]:
+        info = session.describe()
+        flags = ''.join(flag for flag, on in (("📡", info['broadcast']), ("📅", info['plan'])) if on)
+        lines.append(f"<#{info['vcid']}> {info['state']} · {info['current'] or '—'} · queue {info['queue']} · "
+                     f"age {info['age'] / 60:.0f} min · idle {info['inactive'] / 60:.0f} min · "
+                     f"{info['bytes']} B {flags}")
+    if len(sessions) > len(lines):
+        lines.append(f"… and {len(sessions) - len(lines)} more")
+    await ctx.send(embed=discord.Embed(title="🎧 Sessions", description="\n".join(lines) or "No sessions",
+                                       color=discord.Color.blue()))
+
+@bot.hybrid_command(name="reload", description="Reload the manifest from R2 without interrupting playback")
+@commands.is_owner()
+async def reload_manifest(ctx, force: bool = False):
+    await ctx.defer()
+    summary = await fetch_manifest(force=force)
+    if summary is None:
+        return await ctx.send(f"❌ Reload failed, still serving v{manifest_for().version}.")
+    await ctx.send(f"🔄 {summary}")
 
 @bot.hybrid_command(description="Show the Bible audio control panel")
 async def panel(ctx):
@@ -832,28 +3264,26 @@ async def queue(ctx):
     if not ctx.author.voice or not ctx.author.voice.channel:
         return await ctx.send("❌ Join a VC first.")
     
-    vcid = ctx.author.voice.channel.id
-    if vcid not in playback_queue or not playback_queue[vcid]:
+    session = get_session(ctx.author.voice.channel.id)
+    if session is None or not session.queue:
         return await ctx.send("📝 Queue is empty.")
     
     queue_list = []
-    for i, item in enumerate(playback_queue[vcid], 1):
-        if isinstance(item, tuple):
+    for i, (index, start_verse, end_verse, snapshot) in enumerate(session.queue, 1):
+        entry = snapshot.chapters[index]
+        if start_verse is not None:
             # Handle verse range in queue
-            index, start_verse, end_verse = item
-            entry = manifest_data[index]
-            queue_list.append(f"**{i}**. {entry['book']} {entry['chapter']}:{start_verse}-{end_verse}")
+            queue_list.append(f"**{i}**. {entry.label}:{start_verse}-{end_verse}")
         else:
             # Handle regular chapter in queue
-            entry = manifest_data[item]
-            queue_list.append(f"**{i}**. {entry['book']} {entry['chapter']}")
+            queue_list.append(f"**{i}**. {entry.label}")
     
     embed = discord.Embed(
         title="📋 Playback Queue",
         description="\n".join(queue_list),
         color=discord.Color.blue()
     )
-    embed.set_footer(text=f"Total: {len(playback_queue[vcid])} item(s)")
+    embed.set_footer(text=f"Total: {len(session.queue)} item(s)")
     await ctx.send(embed=embed)
 
 @bot.hybrid_command(description="Pause current playback")
@@ -863,12 +3293,9 @@ async def pause(ctx):
     
     vc = ctx.guild.voice_client
     if vc and vc.is_playing():
-        vcid = ctx.author.voice.channel.id
+        # No pause bookkeeping needed: the source clock stops while no frames are read
         vc.pause()
-        # Track pause state for verse synchronization
-        if vcid not in pause_state:
-            pause_state[vcid] = {'total_pause_time': 0.0, 'pause_start_time': None}
-        pause_state[vcid]['pause_start_time'] = time.time()
+        verse_scheduler.rearm(vc.channel.id)
         await ctx.send("⏸ Paused.")
     else:
         await ctx.send("❌ Nothing is playing.")
@@ -880,13 +3307,8 @@ async def resume(ctx):
     
     vc = ctx.guild.voice_client
     if vc and vc.is_paused():
-        vcid = ctx.author.voice.channel.id
         vc.resume()
-        # Calculate and store accumulated pause time
-        if vcid in pause_state and pause_state[vcid]['pause_start_time']:
-            pause_duration = time.time() - pause_state[vcid]['pause_start_time']
-            pause_state[vcid]['total_pause_time'] += pause_duration
-            pause_state[vcid]['pause_start_time'] = None
+        verse_scheduler.rearm(vc.channel.id)
         await ctx.send("▶ Resumed.")
     else:
         await ctx.send("❌ Nothing is paused.")
@@ -902,21 +3324,15 @@ async def next_chapter(ctx):
     if not vc or not (vc.is_playing() or vc.is_paused()):
         return await ctx.send("❌ Nothing is playing.")
     
+    # Clear verse range playback state first, so the after-callback moves on
+    session = get_session(vcid)
+    if session:
+        session.stop_after = False
+        session.cancel_stream()
+    
     # Stop current playback
     vc.stop()
     
-    # Clean up current verse task
-    if vcid in active_verse_tasks:
-        active_verse_tasks[vcid].cancel()
-    
-    # Clear pause state
-    if vcid in pause_state:
-        del pause_state[vcid]
-    
-    # Clear verse range playback state
-    if vcid in verse_range_playback:
-        del verse_range_playback[vcid]
-    
     await ctx.send("⏭️ Skipped to next chapter.")
 
 @bot.hybrid_command(description="Stop all playback and clear queue")
@@ -928,230 +3344,826 @@ async def stop(ctx):
     vc = ctx.guild.voice_client
     
     if vc:
+        # Clean up all state first, so the after-callback from stop() has nothing to play
+        cleanup_voice_state(vcid)
         vc.stop()
         await vc.disconnect()
         
-        # Clean up all state
-        if vcid in pause_state:
-            del pause_state[vcid]
-        if vcid in active_verse_tasks:
-            active_verse_tasks[vcid].cancel()
-            del active_verse_tasks[vcid]
-        if vcid in playback_queue:
-            del playback_queue[vcid]
-        if vcid in verse_range_playback:
-            del verse_range_playback[vcid]
-        
         await ctx.send("⏹ Stopped and cleared queue.")
     else:
         await ctx.send("❌ Nothing is playing.")
 
 # === UI PANEL ===
-async def send_panel(channel):
-    class AudioControlPanel(View):
-        def __init__(self):
-            super().__init__(timeout=None)
-            self.selected_book = None
-            self.selected_chapter = 1
-            self.chapter_page = 0
-            self.book_page = 0
-            self.all_chapters = []
-
-            canonical_order = [
-                "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy",
-                "Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel", "1 Kings", "2 Kings",
-                "1 Chronicles", "2 Chronicles", "Ezra", "Nehemiah", "Esther", "Job",
-                "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon", "Isaiah",
-                "Jeremiah", "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel",
-                "Amos", "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah",
-                "Haggai", "Zechariah", "Malachi", "Matthew", "Mark", "Luke", "John",
-                "Acts", "Romans", "1 Corinthians", "2 Corinthians", "Galatians",
-                "Ephesians", "Philippians", "Colossians", "1 Thessalonians", "2 Thessalonians",
-                "1 Timothy", "2 Timothy", "Titus", "Philemon", "Hebrews", "James",
-                "1 Peter", "2 Peter", "1 John", "2 John", "3 John", "Jude", "Revelation"
-            ]
-
-            seen = set()
-            all_books = [entry["book"] for entry in manifest_data]
-            self.sorted_books = [book for book in canonical_order if book in all_books and not (book in seen or seen.add(book))]
-
-            # Section selector to split 66 books into groups that fit 25-item limit
-            ot_set = set(canonical_order[:39])
-            nt_set = set(canonical_order[39:])
-            self.ot_books = [b for b in self.sorted_books if b in ot_set]
-            self.nt_books = [b for b in self.sorted_books if b in nt_set]
-            # Split OT into Law/History (Gen-Esther=17) and Poetry/Prophets (Job-Malachi=22)
-            ot_split = canonical_order.index("Job")  # 17
-            ot_set1 = set(canonical_order[:ot_split])
-            ot_set2 = set(canonical_order[ot_split:39])
-            self.book_sections = {
-                "Law & History": [b for b in self.sorted_books if b in ot_set1],
-                "Poetry & Prophets": [b for b in self.sorted_books if b in ot_set2],
-                "New Testament": self.nt_books,
-            }
-
-            self.section_select = discord.ui.Select(
-                placeholder="📖 Old Testament or New Testament...",
-                options=[
-                    discord.SelectOption(label="Law & History", description="Genesis — Esther", emoji="📜"),
-                    discord.SelectOption(label="Poetry & Prophets", description="Job — Malachi", emoji="📖"),
-                    discord.SelectOption(label="New Testament", description="Matthew — Revelation", emoji="✝️"),
-                ],
-                row=0
-            )
-            self.section_select.callback = self.section_selected
-            self.add_item(self.section_select)
-
-            self.book_select = discord.ui.Select(placeholder="📚 Select a book...", options=[discord.SelectOption(label="Pick testament first", value="_")], disabled=True, row=1)
-            self.book_select.callback = self.book_selected
-            self.add_item(self.book_select)
-
-            self.chapter_select = discord.ui.Select(placeholder="🔢 Select chapter...", options=[discord.SelectOption(label="Pick book first", value="_")], disabled=True, row=2)
-            self.chapter_select.callback = self.chapter_changed
-            self.add_item(self.chapter_select)
-
-            self.prev_ch_page = Button(label="◀", style=discord.ButtonStyle.secondary, row=3)
-            self.next_ch_page = Button(label="▶", style=discord.ButtonStyle.secondary, row=3)
-            self.prev_ch_page.callback = self.prev_chapter_page
-            self.next_ch_page.callback = self.next_chapter_page
-            self.add_item(self.prev_ch_page)
-            self.add_item(self.next_ch_page)
-
-            self.play_button = Button(label="Play", style=discord.ButtonStyle.green, emoji="▶️", row=4)
-            self.pause_button = Button(label="Pause", style=discord.ButtonStyle.blurple, emoji="⏸", row=4)
-            self.resume_button = Button(label="Resume", style=discord.ButtonStyle.green, emoji="▶", row=4)
-            self.stop_button = Button(label="Stop", style=discord.ButtonStyle.red, emoji="⏹", row=4)
-            self.play_button.callback = self.play
-            self.pause_button.callback = self.pause
-            self.resume_button.callback = self.resume
-            self.stop_button.callback = self.stop
-            self.add_item(self.play_button)
-            self.add_item(self.pause_button)
-            self.add_item(self.resume_button)
-            self.add_item(self.stop_button)
-
-        async def section_selected(self, interaction):
-            chosen = self.section_select.values[0]
-            books = self.book_sections.get(chosen, [])
-            self.book_select.options = [discord.SelectOption(label=book) for book in books[:25]]
-            self.book_select.disabled = False
-            self.book_select.placeholder = f"📚 Select a book..."
-            # Reset chapter select
-            self.chapter_select.options = [discord.SelectOption(label="Pick book first", value="_")]
-            self.chapter_select.disabled = True
-            await interaction.response.edit_message(view=self)
-
-        async def book_selected(self, interaction):
-            self.selected_book = self.book_select.values[0]
-            self.all_chapters = sorted({int(e["chapter"]) for e in manifest_data if e["book"] == self.selected_book})
-            self.chapter_page = 0
-            self._update_chapter_dropdown()
-            self.chapter_select.disabled = False
-            selection_text = f"📘 **{self.selected_book}**"
-            await interaction.response.edit_message(content=selection_text, view=self)
-
-        async def chapter_changed(self, interaction):
-            self.selected_chapter = int(self.chapter_select.values[0])
-            selection_text = f"📘 **{self.selected_book} {self.selected_chapter}**"
-            await interaction.response.edit_message(content=selection_text, view=self)
-
-        def _update_chapter_dropdown(self):
-            start = self.chapter_page * 25
-            end = start + 25
-            sliced = self.all_chapters[start:end]
-            total_pages = (len(self.all_chapters) - 1) // 25 + 1
-            if total_pages > 1:
-                ch_start, ch_end = sliced[0], sliced[-1]
-                self.chapter_select.placeholder = f"🔢 Chapters {ch_start}–{ch_end}  ({self.chapter_page+1}/{total_pages})"
-            else:
-                self.chapter_select.placeholder = f"🔢 {self.selected_book} chapter..."
-            self.chapter_select.options = [discord.SelectOption(label=str(ch)) for ch in sliced]
-
-        async def prev_chapter_page(self, interaction):
-            if self.chapter_page > 0:
-                self.chapter_page -= 1
-                self._update_chapter_dropdown()
-            await interaction.response.edit_message(view=self)
-
-        async def next_chapter_page(self, interaction):
-            max_page = (len(self.all_chapters) - 1) // 25
-            if self.chapter_page < max_page:
-                self.chapter_page += 1
-                self._update_chapter_dropdown()
-            await interaction.response.edit_message(view=self)
-
-        async def play(self, interaction):
-            await interaction.response.send_message("▶️ Playing...", ephemeral=True)
-            if not interaction.user.voice or not interaction.user.voice.channel:
-                return await interaction.followup.send("❌ Join a VC first.", ephemeral=True)
-            index = get_index(self.selected_book, self.selected_chapter)
-            if index is None:
-                return await interaction.followup.send("❌ Not found.", ephemeral=True)
-            ctx = await bot.get_context(interaction.message)
-            ctx.author = interaction.user
-            await play_entry(ctx, index)
-
-        async def pause(self, interaction):
-            vc = interaction.guild.voice_client
-            if vc and vc.is_playing():
-                vcid = interaction.guild.voice_client.channel.id
-                vc.pause()
-                # Track pause state for verse synchronization
-                if vcid not in pause_state:
-                    pause_state[vcid] = {'total_pause_time': 0.0, 'pause_start_time': None}
-                pause_state[vcid]['pause_start_time'] = time.time()
-                await interaction.response.send_message("⏸ Paused.", ephemeral=True)
-
-        async def resume(self, interaction):
-            vc = interaction.guild.voice_client
-            if vc and vc.is_paused():
-                vcid = interaction.guild.voice_client.channel.id
-                vc.resume()
-                # Calculate and store accumulated pause time
-                if vcid in pause_state and pause_state[vcid]['pause_start_time']:
-                    pause_duration = time.time() - pause_state[vcid]['pause_start_time']
-                    pause_state[vcid]['total_pause_time'] += pause_duration
-                    pause_state[vcid]['pause_start_time'] = None
-                await interaction.response.send_message("▶ Resumed.", ephemeral=True)
-
-        async def stop(self, interaction):
-            vc = interaction.guild.voice_client
-            if vc:
-                vcid = interaction.guild.voice_client.channel.id
-                vc.stop()
-                await vc.disconnect()
-                # Clean up all state
-                if vcid in pause_state:
-                    del pause_state[vcid]
-                if vcid in active_verse_tasks:
-                    active_verse_tasks[vcid].cancel()
-                    del active_verse_tasks[vcid]
-                if vcid in playback_queue:
-                    del playback_queue[vcid]
-                if vcid in verse_range_playback:
-                    del verse_range_playback[vcid]
-                await interaction.response.send_message("⏹ Stopped and cleared queue.", ephemeral=True)
+CANONICAL_BOOKS = [
+    "Genesis", "Exodus", "Leviticus", "Numbers", "Deuteronomy",
+    "Joshua", "Judges", "Ruth", "1 Samuel", "2 Samuel", "1 Kings", "2 Kings",
+    "1 Chronicles", "2 Chronicles", "Ezra", "Nehemiah", "Esther", "Job",
+    "Psalms", "Proverbs", "Ecclesiastes", "Song of Solomon", "Isaiah",
+    "Jeremiah", "Lamentations", "Ezekiel", "Daniel", "Hosea", "Joel",
+    "Amos", "Obadiah", "Jonah", "Micah", "Nahum", "Habakkuk", "Zephaniah",
+    "Haggai", "Zechariah", "Malachi", "Matthew", "Mark", "Luke", "John",
+    "Acts", "Romans", "1 Corinthians", "2 Corinthians", "Galatians",
+    "Ephesians", "Philippians", "Colossians", "1 Thessalonians", "2 Thessalonians",
+    "1 Timothy", "2 Timothy", "Titus", "Philemon", "Hebrews", "James",
+    "1 Peter", "2 Peter", "1 John", "2 John", "3 John", "Jude", "Revelation"
+]
+# Split the 66 books into groups that fit the 25-option select limit:
+# (name, description, emoji, slice of CANONICAL_BOOKS)
+PANEL_SECTIONS = [
+    ("Law & History", "Genesis — Esther", "📜", 0, 17),
+    ("Poetry & Prophets", "Job — Malachi", "📖", 17, 39),
+    ("New Testament", "Matthew — Revelation", "✝️", 39, 66),
+]
+CHAPTERS_PER_PAGE = 25
+# kind: (label, style, emoji, row)
+PANEL_BUTTONS = {
+    'prev':   ("◀", discord.ButtonStyle.secondary, None, 3),
+    'next':   ("▶", discord.ButtonStyle.secondary, None, 3),
+    'play':   ("Play", discord.ButtonStyle.green, "▶️", 4),
+    'pause':  ("Pause", discord.ButtonStyle.blurple, "⏸", 4),
+    'resume': ("Resume", discord.ButtonStyle.green, "▶", 4),
+    'stop':   ("Stop", discord.ButtonStyle.red, "⏹", 4),
+}
+
+class PanelState:
+    """
+    What a panel currently shows. It lives in the components' custom_ids
+    (`bible:<kind>:<section>:<book>:<page>:<chapter>`), not in a Python object per message,
+    so any panel can be answered by any process, including after a restart.
+    """
+    __slots__ = ('section', 'book', 'page', 'chapter')
+
+    def __init__(self, section=None, book=None, page=0, chapter=None):
+        self.section = section
+        self.book = book
+        self.page = page
+        self.chapter = chapter
+
+    @classmethod
+    def parse(cls, text):
+        if not text:
+            return cls()
+        section, book, page, chapter = text.split(':')
+        return cls(int(section) if section else None, book or None,
+                   int(page) if page else 0, int(chapter) if chapter else None)
+
+    def encode(self):
+        section = '' if self.section is None else self.section
+        return f"{section}:{self.book or ''}:{self.page}:{self.chapter or ''}"
+
+class PanelLayout:
+    """
+    The parts of the panel that only depend on the manifest, built once per version.
+    Dropdown callbacks only pick prebuilt pieces out of it, so they answer well inside
+    Discord's 3 s interaction deadline even when the loop is busy.
+    """
+    __slots__ = ('snapshot', 'sections', 'section_options', 'book_options', 'chapter_pages', 'base_view')
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        book_chapters = snapshot.index.book_chapters if snapshot.index else {}
+        present = book_chapters.keys()
+        self.sections = [[book for book in CANONICAL_BOOKS[first:last] if book in present]
+                         for _, _, _, first, last in PANEL_SECTIONS]
+        self.section_options = [
+            discord.SelectOption(label=name, description=description, emoji=emoji, value=str(i))
+            for i, (name, description, emoji, _, _) in enumerate(PANEL_SECTIONS)
+        ]
+        self.book_options = [[discord.SelectOption(label=book) for book in books[:25]]
+                             for books in self.sections]
+        # {book: [(placeholder, [SelectOption]), ...]}, one entry per 25-chapter page
+        self.chapter_pages = {book: paginate_chapters(book, chapters)
+                              for book, chapters in book_chapters.items()}
+        self.base_view = build_panel_view(self, PanelState())
+
+    def pages(self, book):
+        return self.chapter_pages.get(book, ()) if book else ()
+
+def paginate_chapters(book, chapters):
+    pages = []
+    total_pages = (len(chapters) - 1) // CHAPTERS_PER_PAGE + 1
+    for page in range(total_pages):
+        start = page * CHAPTERS_PER_PAGE
+        sliced = chapters[start:start + CHAPTERS_PER_PAGE]
+        if total_pages > 1:
+            placeholder = f"🔢 Chapters {sliced[0]}–{sliced[-1]}  ({page + 1}/{total_pages})"
+        else:
+            placeholder = f"🔢 {book} chapter..."
+        pages.append((placeholder, [discord.SelectOption(label=str(ch)) for ch in sliced]))
+    return pages
+
+panel_layout = None
+
+def get_panel_layout():
+    global panel_layout
+    snapshot = manifest_for()
+    if panel_layout is None or panel_layout.snapshot is not snapshot:
+        panel_layout = PanelLayout(snapshot)
+    return panel_layout
 
+def build_panel_view(layout, state):
+    """A View of PanelSelect / PanelButton items for state; nothing in it needs to be kept"""
+    view = View(timeout=None)
+
+    section_placeholder = "📖 Old Testament or New Testament..."
+    if state.section is not None:
+        section_placeholder = f"📖 {PANEL_SECTIONS[state.section][0]}"
+    view.add_item(PanelSelect('section', state, placeholder=section_placeholder,
+                              options=list(layout.section_options), row=0))
+
+    if state.section is None:
+        view.add_item(PanelSelect('book', state, placeholder="📚 Select a book...",
+                                  options=[discord.SelectOption(label="Pick testament first", value="_")],
+                                  disabled=True, row=1))
+    else:
+        view.add_item(PanelSelect('book', state, placeholder="📚 Select a book...",
+                                  options=list(layout.book_options[state.section]), row=1))
+
+    pages = layout.pages(state.book)
+    if not pages:
+        view.add_item(PanelSelect('chapter', state, placeholder="🔢 Select chapter...",
+                                  options=[discord.SelectOption(label="Pick book first", value="_")],
+                                  disabled=True, row=2))
+    else:
+        placeholder, options = pages[min(state.page, len(pages) - 1)]
+        view.add_item(PanelSelect('chapter', state, placeholder=placeholder, options=list(options), row=2))
+
+    for kind in PANEL_BUTTONS:
+        view.add_item(PanelButton(kind, state))
+    return view
+
+class PanelSelect(discord.ui.DynamicItem[discord.ui.Select],
+                  template=r'bible:(?P<kind>section|book|chapter):(?P<state>[^:]*:[^:]*:\d*:\d*)'):
+    def __init__(self, kind, state, item=None, **select_options):
+        if item is None:
+            item = discord.ui.Select(custom_id=f"bible:{kind}:{state.encode()}", **select_options)
+        super().__init__(item)
+        self.kind = kind
+        self.state = state
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match['kind'], PanelState.parse(match['state']), item)
+
+    async def callback(self, interaction):
+        value = self.item.values[0]
+        layout = get_panel_layout()
+        if self.kind == 'section':
+            state = PanelState(section=int(value))
+            await interaction.response.edit_message(view=build_panel_view(layout, state))
+        elif self.kind == 'book':
+            state = PanelState(section=self.state.section, book=value)
+            await interaction.response.edit_message(content=f"📘 **{value}**",
+                                                    view=build_panel_view(layout, state))
+        else:
+            state = PanelState(self.state.section, self.state.book, self.state.page, int(value))
+            await interaction.response.edit_message(content=f"📘 **{state.book} {state.chapter}**",
+                                                    view=build_panel_view(layout, state))
+
+class PanelButton(discord.ui.DynamicItem[discord.ui.Button],
+                  template=r'bible:(?P<kind>prev|next|play|pause|resume|stop)(?::(?P<state>[^:]*:[^:]*:\d*:\d*))?'):
+    def __init__(self, kind, state, item=None):
+        if item is None:
+            label, style, emoji, row = PANEL_BUTTONS[kind]
+            # Transport buttons don't depend on the selection, so their ids never change
+            custom_id = f"bible:{kind}:{state.encode()}" if kind in ('prev', 'next', 'play') else f"bible:{kind}"
+            item = Button(label=label, style=style, emoji=emoji, row=row, custom_id=custom_id)
+        super().__init__(item)
+        self.kind = kind
+        self.state = state
+
+    @classmethod
+    async def from_custom_id(cls, interaction, item, match):
+        return cls(match['kind'], PanelState.parse(match['state']), item)
+
+    async def callback(self, interaction):
+        await getattr(self, f"on_{self.kind}")(interaction)
+
+    async def on_prev(self, interaction):
+        await self.turn_page(interaction, -1)
+
+    async def on_next(self, interaction):
+        await self.turn_page(interaction, 1)
+
+    async def turn_page(self, interaction, step):
+        layout = get_panel_layout()
+        max_page = max(len(layout.pages(self.state.book)) - 1, 0)
+        page = min(max(self.state.page + step, 0), max_page)
+        state = PanelState(self.state.section, self.state.book, page, self.state.chapter)
+        await interaction.response.edit_message(view=build_panel_view(layout, state))
+
+    async def on_play(self, interaction):
+        await interaction.response.send_message("▶️ Playing...", ephemeral=True)
+        if not interaction.user.voice or not interaction.user.voice.channel:
+            return await interaction.followup.send("❌ Join a VC first.", ephemeral=True)
+        index = None
+        if self.state.book:
+            index = get_index(self.state.book, self.state.chapter or 1)
+        if index is None:
+            return await interaction.followup.send("❌ Not found.", ephemeral=True)
+        ctx = await bot.get_context(interaction.message)
+        ctx.author = interaction.user
+        await play_entry(ctx, index)
+
+    async def on_pause(self, interaction):
+        vc = interaction.guild.voice_client
+        if vc and vc.is_playing():
+            vc.pause()
+            verse_scheduler.rearm(vc.channel.id)
+            await interaction.response.send_message("⏸ Paused.", ephemeral=True)
+
+    async def on_resume(self, interaction):
+        vc = interaction.guild.voice_client
+        if vc and vc.is_paused():
+            vc.resume()
+            verse_scheduler.rearm(vc.channel.id)
+            await interaction.response.send_message("▶ Resumed.", ephemeral=True)
+
+    async def on_stop(self, interaction):
+        vc = interaction.guild.voice_client
+        if vc:
+            # Clean up all state first, same as !stop
+            cleanup_voice_state(vc.channel.id)
+            vc.stop()
+            await vc.disconnect()
+            await interaction.response.send_message("⏹ Stopped and cleared queue.", ephemeral=True)
+
+async def send_panel(channel):
     if channel.id in last_panel_message:
         try:
             await last_panel_message[channel.id].delete()
         except:
             pass
 
-    panel_msg = await channel.send("🎛️ Bible Audio Control Panel", view=AudioControlPanel())
+    panel_msg = await channel.send("🎛️ Bible Audio Control Panel", view=get_panel_layout().base_view)
     last_panel_message[channel.id] = panel_msg
 
+# === READING PLANS ===
+# kind: (name, slice of CANONICAL_BOOKS)
+PLAN_KINDS = {
+    'bible': ("Whole Bible", 0, 66),
+    'ot':    ("Old Testament", 0, 39),
+    'nt':    ("New Testament", 39, 66),
+}
+
+class ReadingPlan:
+    """
+    A daily reading in one voice channel. Only the schedule is stored (one short JSON row);
+    which chapters a day covers is worked out from the manifest when it starts, so plans
+    keep working across manifest reloads.
+    """
+    __slots__ = ('guild_id', 'channel_id', 'text_channel_id', 'kind', 'start_day', 'days', 'minute', 'last_day')
+
+    def __init__(self, guild_id, channel_id, text_channel_id, kind, start_day, days, minute, last_day=-1):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.text_channel_id = text_channel_id
+        self.kind = kind
+        self.start_day = start_day  # UTC day number (days since the epoch) of day 1
+        self.days = days
+        self.minute = minute        # Start time, minutes after UTC midnight
+        self.last_day = last_day    # Last UTC day number a reading was started for
+
+    def to_row(self):
+        return [self.guild_id, self.channel_id, self.text_channel_id, self.kind,
+                self.start_day, self.days, self.minute, self.last_day]
+
+    def day_number(self, day):
+        """0-based plan day for a UTC day number, or None outside the plan"""
+        n = day - self.start_day
+        return n if 0 <= n < self.days else None
+
+    def start_time(self, day):
+        return day * 86400 + self.minute * 60
+
+    def time_label(self):
+        return f"{self.minute // 60:02d}:{self.minute % 60:02d} UTC"
+
+plan_sequences = {}  # {kind: (snapshot, [manifest index, ...] in canonical order)}
+
+def plan_sequence(snapshot, kind):
+    """Every chapter a plan kind covers, as indices into snapshot, in reading order"""
+    cached = plan_sequences.get(kind)
+    if cached and cached[0] is snapshot:
+        return cached[1]
+    _, first, last = PLAN_KINDS[kind]
+    book_chapters = snapshot.index.book_chapters if snapshot.index else {}
+    sequence = []
+    for book in CANONICAL_BOOKS[first:last]:
+        for chapter in book_chapters.get(book, ()):
+            index = snapshot.index.lookup(book, chapter)
+            if index is not None:
+                sequence.append(index)
+    plan_sequences[kind] = (snapshot, sequence)
+    return sequence
+
+def plan_chapters(snapshot, plan, day_number):
+    """Indices of the chapters read on a plan day; the sequence is split evenly over plan.days"""
+    sequence = plan_sequence(snapshot, plan.kind)
+    n = len(sequence)
+    return sequence[day_number * n // plan.days:(day_number + 1) * n // plan.days]
+
+def load_reading_plans():
+    try:
+        with open(READING_PLANS_PATH) as f:
+            rows = json.load(f)['plans']
+    except FileNotFoundError:
+        return
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Couldn't read reading plans: {e}")
+        return
+    for row in rows:
+        plan = ReadingPlan(*row)
+        reading_plans[plan.channel_id] = plan
+    print(f"📅 Loaded {len(reading_plans)} reading plan(s)")
+
+async def save_reading_plans():
+    """
+    Write our guilds' plans, keeping rows for guilds this process doesn't serve:
+    with several workers each one owns (and only ever changes) its own guilds' rows.
+    Saves in this process run one at a time, so an older snapshot never lands last.
+    """
+    async with plans_save_lock:
+        owned = {guild.id for guild in bot.guilds}
+        rows = [plan.to_row() for plan in reading_plans.values() if plan.guild_id in owned]
+        await asyncio.get_running_loop().run_in_executor(None, write_reading_plans, owned, rows)
+
+def write_reading_plans(owned, rows):
+    """
+    Merge our rows into the file (blocking; run in an executor). Everyone else's rows come
+    only from the file as read under an exclusive lock on a sidecar file, so workers saving
+    at the same moment don't drop each other's changes or bring back deleted plans.
+    """
+    try:
+        lock_file = open(READING_PLANS_PATH + ".lock", 'a')
+    except OSError as e:
+        print(f"⚠️ Couldn't save reading plans: {e}")
+        return
+    with lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)  # Held for one small read and write
+        merged = []
+        try:
+            with open(READING_PLANS_PATH) as f:
+                merged = [row for row in json.load(f)['plans'] if row[0] not in owned]
+        except (OSError, ValueError, KeyError):
+            pass
+        merged.extend(rows)
+        try:
+            write_file_atomic(READING_PLANS_PATH, json.dumps({'plans': merged},
+                                                             separators=(',', ':')).encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ Couldn't save reading plans: {e}")
+
+async def connect_for_plan(plan, start_at, connecting):
+    """Join the plan's voice channel ahead of its start; returns a SessionContext or None"""
+    guild = bot.get_guild(plan.guild_id)
+    channel = guild.get_channel(plan.channel_id) if guild else None
+    text_channel = guild.get_channel(plan.text_channel_id) if guild else None
+    if channel is None or text_channel is None:
+        print(f"⚠️ Reading plan channel {plan.channel_id} is gone, skipping")
+        plan_stats['skipped'] += 1
+        return None
+    session = get_session(channel.id)
+    vc = session.vc if session else None
+    if vc and vc.is_connected() and (vc.is_playing() or vc.is_paused()):
+        # Don't cut off whatever the channel is listening to
+        plan_stats['skipped'] += 1
+        await text_channel.send("📅 Skipping today's reading: something is already playing.")
+        return None
+    ctx = SessionContext(channel, text_channel)
+    async with connecting:
+        try:
+            await ensure_voice_connection(ctx, channel.id)
+        except ConnectionError as e:
+            print(f"❌ Reading plan couldn't join {channel.id}: {e}")
+            plan_stats['connect_failures'] += 1
+            return None
+    open_session(channel.id).plan_start = start_at
+    return ctx
+
+async def start_plan_reading(ctx, plan, day_number, chapters, snapshot):
+    session = get_session(ctx.author.voice.channel.id)
+    if session is None or not session.connected or session.plan_start is None:
+        return  # Disconnected or stopped while waiting for the start time
+    first, last = snapshot.chapters[chapters[0]], snapshot.chapters[chapters[-1]]
+    reading = first.label if len(chapters) == 1 else f"{first.label} – {last.label}"
+    await ctx.send(f"📅 Day {day_number + 1} of {plan.days}: **{reading}**")
+    # Every channel on the same plan day plays the same audio, so they share broadcasts
+    session.broadcast = True
+    session.queue = [(index, None, None, snapshot) for index in chapters[1:]]
+    await play_entry(ctx, chapters[0], snapshot=snapshot)
+    plan_stats['started'] += 1
+
+def finish_plan_session(session):
+    session.plan_start = None
+    session.broadcast = False
+
+async def ramp_up_plans(start_at, runs):
+    """
+    Start a batch of plans due at the same time. Voice connections are spread evenly, with
+    jitter, over the window before the start (at most PLAN_MAX_CONNECTING at once), and the
+    day's audio is cached once up front, so neither Discord nor R2 sees a burst. Playback
+    then starts everywhere together and shares one decoder per chapter.
+    """
+    snapshot = manifest_for()
+    random.shuffle(runs)
+    readings = []
+    for day, plan in runs:
+        day_number = plan.day_number(day)
+        chapters = plan_chapters(snapshot, plan, day_number)
+        if chapters:
+            readings.append((plan, day_number, chapters))
+    urls = {snapshot.chapters[index].opus_url or snapshot.chapters[index].url
+            for _, _, chapters in readings for index in chapters}
+    for url in urls:
+        audio_cache.fill(url)
+
+    window = max(0.0, start_at - time.time() - 5)  # Leave a few seconds for the last handshakes
+    spacing = window / len(readings) if readings else 0.0
+    connecting = asyncio.Semaphore(PLAN_MAX_CONNECTING)
+    print(f"📅 Ramping up {len(readings)} reading plan(s) over {window:.0f}s ({len(urls)} chapter file(s))")
+
+    async def connect(i, plan):
+        await asyncio.sleep(i * spacing + random.uniform(0, spacing))
+        return await connect_for_plan(plan, start_at, connecting)
+
+    contexts = await asyncio.gather(*(connect(i, plan) for i, (plan, _, _) in enumerate(readings)),
+                                    return_exceptions=True)
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+    starts = [start_plan_reading(ctx, plan, day_number, chapters, snapshot)
+              for ctx, (plan, day_number, chapters) in zip(contexts, readings)
+              if isinstance(ctx, SessionContext)]
+    for result in await asyncio.gather(*starts, return_exceptions=True):
+        if isinstance(result, Exception):
+            print(f"❌ Reading plan start failed: {result}")
+
+async def run_due_plans():
+    """Kick off a ramp-up for plans whose start time is within the ramp window"""
+    now = time.time()
+    today = int(now // 86400)
+    batches = {}  # {start time: [(day, plan), ...]}
+    for plan in reading_plans.values():
+        if bot.get_guild(plan.guild_id) is None:
+            continue  # Another worker's guild
+        for day in (today - 1, today, today + 1):
+            if plan.last_day >= day or plan.day_number(day) is None:
+                continue
+            start_at = plan.start_time(day)
+            if start_at - PLAN_RAMP_SECONDS <= now <= start_at + PLAN_LATE_GRACE_SECONDS:
+                plan.last_day = day
+                batches.setdefault(start_at, []).append((day, plan))
+                break
+    if not batches:
+        return
+    await save_reading_plans()  # Record the start first, so a restart mid-ramp doesn't read it twice
+    for start_at, runs in batches.items():
+        task = asyncio.create_task(ramp_up_plans(start_at, runs))
+        plan_tasks.add(task)
+        task.add_done_callback(plan_tasks.discard)
+
+async def reading_plan_loop():
+    while True:
+        try:
+            await run_due_plans()
+        except Exception as e:
+            print(f"❌ Reading plan scheduler error: {e}")
+            traceback.print_exc()
+        await asyncio.sleep(PLAN_CHECK_SECONDS)
+
+def parse_plan_time(text):
+    """"HH:MM" (UTC) -> minutes after midnight"""
+    hours, _, minutes = text.partition(':')
+    minute = int(hours) * 60 + int(minutes or 0)
+    if not 0 <= minute < 1440:
+        raise ValueError(text)
+    return minute
+
+@bot.hybrid_group(name="plan", description="Daily reading plan for your voice channel", fallback="show")
+async def reading_plan(ctx):
+    plans = [plan for plan in reading_plans.values() if plan.guild_id == ctx.guild.id]
+    if not plans:
+        return await ctx.send("📅 No reading plans in this server. Start one with `/plan start`.")
+    today = int(time.time() // 86400)
+    lines = []
+    for plan in plans:
+        day_number = plan.day_number(today)
+        progress = f"day {day_number + 1} of {plan.days}" if day_number is not None else f"{plan.days} days"
+        lines.append(f"<#{plan.channel_id}> · {PLAN_KINDS[plan.kind][0]} · {plan.time_label()} · {progress}")
+    await ctx.send(embed=discord.Embed(title="📅 Reading Plans", description="\n".join(lines),
+                                       color=discord.Color.blue()))
+
+@reading_plan.command(name="start", description="Read through the Bible in your voice channel every day")
+@commands.has_permissions(manage_guild=True)
+async def plan_start(ctx, kind: str = 'bible', at: str = '06:00', days: int = 365):
+    if not ctx.author.voice or not ctx.author.voice.channel:
+        return await ctx.send("❌ Join a VC first.")
+    kind = kind.lower()
+    if kind not in PLAN_KINDS:
+        return await ctx.send(f"❌ Unknown plan. Choose one of: {', '.join(PLAN_KINDS)}")
+    try:
+        minute = parse_plan_time(at)
+    except ValueError:
+        return await ctx.send("❌ Use a UTC time like `06:00`.")
+    if not 1 <= days <= 3650:
+        return await ctx.send("❌ Days must be between 1 and 3650.")
+
+    now = time.time()
+    today = int(now // 86400)
+    # Day 1 is today if the start time is still ahead, otherwise tomorrow
+    start_day = today if today * 86400 + minute * 60 > now else today + 1
+    channel = ctx.author.voice.channel
+    plan = ReadingPlan(ctx.guild.id, channel.id, ctx.channel.id, kind, start_day, days, minute)
+    reading_plans[channel.id] = plan
+    await save_reading_plans()
+    chapters = len(plan_sequence(manifest_for(), kind))
+    await ctx.send(f"📅 {PLAN_KINDS[kind][0]} in {channel.mention}: {chapters} chapters over {days} days, "
+                   f"daily at {plan.time_label()}.")
+
+@reading_plan.command(name="stop", description="Remove the reading plan for your voice channel")
+@commands.has_permissions(manage_guild=True)
+async def plan_stop(ctx):
+    if not ctx.author.voice or not ctx.author.voice.channel:
+        return await ctx.send("❌ Join a VC first.")
+    if reading_plans.pop(ctx.author.voice.channel.id, None) is None:
+        return await ctx.send("❌ No reading plan in this channel.")
+    await save_reading_plans()
+    await ctx.send("📅 Reading plan removed.")
+
+# === REAPER ===
+async def reap_idle_voice():
+    """Disconnect connections that sat idle or alone past their timeout; returns how many"""
+    now = time.monotonic()
+    reclaimed = 0
+    connected = set()
+    for vc in list(bot.voice_clients):
+        channel = vc.channel
+        vcid = channel.id
+        connected.add(vcid)
+        session = open_session(vcid)
+        session.vc = session.vc or vc
+        alone = not any(not member.bot for member in channel.members)
+        if vc.is_playing() and not alone or (session.plan_start or 0) > time.time():
+            # Playing to someone, or connected early for a reading plan that hasn't started
+            session.idle_since = None
+            session.active_at = now
+            continue
+        if session.idle_since is None:
+            session.idle_since = now
+        since = session.idle_since
+        if now - since < (VOICE_EMPTY_TIMEOUT if alone else VOICE_IDLE_TIMEOUT):
+            continue
+        print(f"🧹 Leaving {'empty' if alone else 'idle'} voice channel {vcid} after {now - since:.0f}s")
+        # Clear the queue first so the after-callback from stop() doesn't start the next item
+        cleanup_voice_state(vcid)
+        vc.stop()
+        try:
+            await vc.disconnect(force=True)
+        except Exception as e:
+            print(f"⚠️ Reaper disconnect error: {e}")
+        reclaimed += 1
+
+    # Sessions whose connection discord.py already dropped, or that never got one
+    for vcid, session in list(sessions.items()):
+        if vcid in connected:
+            continue
+        if session.vc is not None or is_stale_session(session, now):
+            cleanup_voice_state(vcid)
+            reaper_stats['sessions'] += 1
+    return reclaimed
+
+def reap_orphan_ffmpeg():
+    """Kill FFmpeg children no live source owns (and reap exited ones); returns how many"""
+    if not os.path.isdir('/proc'):
+        return 0
+    owned = set()
+    for source in list(ffmpeg_sources):
+        process = getattr(source, '_process', None)
+        pid = getattr(process, 'pid', None)
+        if pid:
+            owned.add(pid)
+    me = os.getpid()
+    reclaimed = 0
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'rb') as f:
+                proc_stat = f.read().decode('utf-8', 'replace')
+        except OSError:
+            continue
+        comm = proc_stat[proc_stat.find('(') + 1:proc_stat.rfind(')')]
+        fields = proc_stat[proc_stat.rfind(')') + 2:].split()
+        if comm != 'ffmpeg' or int(fields[1]) != me:
+            continue
+        pid = int(name)
+        if pid in owned and fields[0] != 'Z':
+            continue
+        try:
+            if fields[0] != 'Z':
+                os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, os.WNOHANG)
+        except (ProcessLookupError, ChildProcessError):
+            pass
+        except OSError as e:
+            print(f"⚠️ Could not reap FFmpeg pid {pid}: {e}")
+            continue
+        reclaimed += 1
+    return reclaimed
+
+def reap_panel_refs():
+    """Forget panels whose channel is gone or that are too old to bother deleting"""
+    now = discord.utils.utcnow()
+    stale = [cid for cid, message in last_panel_message.items()
+             if bot.get_channel(cid) is None
+             or (now - message.created_at).total_seconds() > PANEL_REF_MAX_AGE]
+    for cid in stale:
+        del last_panel_message[cid]
+    return len(stale)
+
+async def reap_once():
+    """One reaper pass; returns (and logs) what it reclaimed"""
+    voice = await reap_idle_voice()
+    ffmpeg = reap_orphan_ffmpeg()
+    temp_files, temp_bytes = audio_cache.sweep_partials()
+    files, size = seek_indexes.sweep_partials()
+    temp_files += files
+    temp_bytes += size
+    cache_dir = os.path.dirname(MANIFEST_CACHE_PATH)
+    prefix = os.path.basename(MANIFEST_CACHE_PATH) + '.'
+    try:
+        manifest_tmp = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+                        if name.startswith(prefix) and name.endswith('.tmp')]
+    except OSError:
+        manifest_tmp = []
+    files, size = remove_stale_temp_files(manifest_tmp)
+    temp_files += files
+    temp_bytes += size
+    panels = reap_panel_refs()
+
+    result = {'voice': voice, 'ffmpeg': ffmpeg, 'temp_files': temp_files,
+              'temp_bytes': temp_bytes, 'panels': panels}
+    reaper_stats['passes'] += 1
+    for key, value in result.items():
+        reaper_stats[key] += value
+    reaper_stats['last'] = result
+    if any(result.values()):
+        print(f"🧹 Reaper: {voice} voice connection(s), {ffmpeg} FFmpeg process(es), "
+              f"{temp_files} temp file(s) ({temp_bytes / 1048576:.1f} MB), {panels} panel ref(s)")
+    return result
+
+async def reaper_loop():
+    """Runs a pass at startup, then every REAPER_INTERVAL_SECONDS"""
+    while True:
+        try:
+            await reap_once()
+        except Exception as e:
+            print(f"❌ Reaper error: {e}")
+            traceback.print_exc()
+        await asyncio.sleep(REAPER_INTERVAL_SECONDS)
+
+# === METRICS ===
+class Histogram:
+    """Cumulative Prometheus histogram; observe() is a bisect and three additions"""
+    __slots__ = ('name', 'help', 'bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, name, help, bounds):
+        self.name = name
+        self.help = help
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, lines):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} histogram")
+        total = 0
+        for bound, n in zip(self.bounds, self.counts):
+            total += n
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {total}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum:.6f}")
+        lines.append(f"{self.name}_count {self.count}")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+first_audio_seconds = Histogram("biblebot_first_audio_seconds",
+                                "From a play command to its first audio frame", LATENCY_BUCKETS)
+ffmpeg_spawn_seconds = Histogram("biblebot_ffmpeg_spawn_seconds",
+                                 "Time to start an FFmpeg process", LATENCY_BUCKETS)
+transition_gap_seconds = Histogram("biblebot_transition_gap_seconds",
+                                   "From one item's end of stream to the next vc.play()", LATENCY_BUCKETS)
+embed_edit_seconds = Histogram("biblebot_embed_edit_seconds",
+                               "Live verse embed send/edit request time", LATENCY_BUCKETS)
+get_index_seconds = Histogram("biblebot_get_index_seconds",
+                              "Book and chapter lookups in the manifest index", FAST_BUCKETS)
+loop_lag_seconds = Histogram("biblebot_loop_lag_seconds",
+                             "How late the event loop ran a timer", LATENCY_BUCKETS)
+histograms = (first_audio_seconds, ffmpeg_spawn_seconds, transition_gap_seconds,
+              embed_edit_seconds, get_index_seconds, loop_lag_seconds)
+
+metrics_runner = None  # aiohttp AppRunner serving /metrics
+metrics_lag_task = None
+
+def running_ffmpeg_count():
+    count = 0
+    for source in list(ffmpeg_sources):
+        process = getattr(source, '_process', None)
+        if process and process.poll() is None:
+            count += 1
+    return count
+
+def render_metrics():
+    """Everything in Prometheus text format; gauges are read here, not kept up to date"""
+    lines = []
+    for histogram in histograms:
+        histogram.render(lines)
+
+    def sample(name, kind, help, value):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name} {value}")
+
+    edits = live_editor_totals()
+    current = manifest_for()
+    sample("biblebot_embed_rate_limited_total", "counter", "Live embed edits answered with 429", edits['rate_limited'])
+    sample("biblebot_embed_edit_failures_total", "counter", "Live embed edits that failed", edits['failures'])
+    sample("biblebot_sessions", "gauge", "Playback sessions", len(sessions))
+    sample("biblebot_sessions_playing", "gauge", "Sessions whose voice client is playing",
+           sum(1 for session in sessions.values() if session.connected and session.vc.is_playing()))
+    sample("biblebot_ffmpeg_processes", "gauge", "Running FFmpeg processes owned by audio sources", running_ffmpeg_count())
+    sample("biblebot_broadcasts", "gauge", "Shared broadcast decoders", broadcast_totals()['broadcasts'])
+    sample("biblebot_manifest_age_seconds", "gauge", "Since the manifest was last fetched or confirmed unchanged",
+           f"{max(0.0, time.time() - current.meta.get('fetched_at', time.time())):.0f}")
+    sample("biblebot_manifest_version", "gauge", "Version of the manifest being served", current.version)
+    return "\n".join(lines) + "\n"
+
+async def serve_metrics(request):
+    return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8",
+                        headers={"Cache-Control": "no-store"})
+
+async def measure_loop_lag():
+    """Samples how late a sleep wakes up; anything blocking the loop shows up here"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(METRICS_LAG_INTERVAL)
+        loop_lag_seconds.observe(max(0.0, loop.time() - started - METRICS_LAG_INTERVAL))
+
+async def start_metrics_server():
+    global metrics_runner, metrics_lag_task
+    if not METRICS_PORT or metrics_runner is not None:
+        return
+    app = web.Application()
+    app.router.add_get("/metrics", serve_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    except OSError as e:
+        print(f"⚠️ Couldn't start metrics endpoint on {METRICS_HOST}:{METRICS_PORT}: {e}")
+        await runner.cleanup()
+        return
+    metrics_runner = runner
+    metrics_lag_task = asyncio.create_task(measure_loop_lag())
+    print(f"📈 Metrics on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
 # === EVENTS ===
 @bot.event
 async def on_ready():
-    print(f"✅ Logged in as {bot.user}")
+    global manifest_refresh_task, reaper_task, plan_task
+    if SHARD_COUNT:
+        shards = bot.shard_ids or list(range(bot.shard_count))
+        print(f"✅ Logged in as {bot.user} (shards {shards} of {bot.shard_count}, pid {os.getpid()})")
+    else:
+        print(f"✅ Logged in as {bot.user}")
     await fetch_manifest()
+    if MANIFEST_REFRESH_MINUTES > 0 and manifest_refresh_task is None:
+        manifest_refresh_task = asyncio.create_task(refresh_manifest_periodically())
+    if reaper_task is None:
+        reaper_task = asyncio.create_task(reaper_loop())
+    if plan_task is None:
+        plan_task = asyncio.create_task(reading_plan_loop())
+    await start_metrics_server()
+    if shard_ids is not None and 0 not in shard_ids:
+        return  # Commands are global; the worker with shard 0 syncs them for everyone
     try:
         synced = await bot.tree.sync()
         print(f"✅ Synced {len(synced)} slash command(s)")
     except Exception as e:
         print(f"❌ Failed to sync commands: {e}")
 
+@bot.event
+async def on_shard_ready(shard_id):
+    print(f"🔗 Shard {shard_id} ready (pid {os.getpid()})")
+
 @bot.event
 async def on_voice_state_update(member, before, after):
     """Clean up when bot is disconnected from voice"""
@@ -1160,5 +4172,14 @@ async def on_voice_state_update(member, before, after):
         cleanup_voice_state(vcid)
         print(f"🧹 Cleaned up state for voice channel {vcid}")
 
+@bot.event
+async def on_raw_message_delete(payload):
+    """Drop the panel reference if someone deleted the panel message"""
+    message = last_panel_message.get(payload.channel_id)
+    if message and message.id == payload.message_id:
+        del last_panel_message[payload.channel_id]
+
 # === LAUNCH BOT ===
+load_manifest_snapshot()
+load_reading_plans()
 bot.run(os.getenv("BOT_TOKEN"))  # ✅ For Railway / Heroku deploy
@@ -0,0 +1,153 @@
+"""
+Minimal stand-in for Discord's REST API and gateway, for exercising sharded startup
+(bot.py / supervisor.py) on one machine without a real bot token or network access.
+
+It answers just enough for discord.py to log in, identify every shard and receive a few
+fake guilds, each delivered to the shard Discord would route it to ((guild_id >> 22) % shards).
+Nothing else works: no voice, no messages, no interactions.
+
+    python fake_gateway.py &
+    DISCORD_API_BASE=http://127.0.0.1:8765/api/v10 \
+    DISCORD_GATEWAY_URL=ws://127.0.0.1:8765/gateway \
+    BOT_TOKEN=fake WORKERS=2 SHARD_COUNT=4 python supervisor.py
+"""
+import asyncio
+import json
+import os
+import time
+
+from aiohttp import web, WSMsgType
+
+HOST = os.getenv("FAKE_GATEWAY_HOST", "127.0.0.1")
+PORT = int(os.getenv("FAKE_GATEWAY_PORT", "8765"))
+GUILD_COUNT = int(os.getenv("FAKE_GUILDS", "8"))
+HEARTBEAT_INTERVAL_MS = 41250
+
+BOT_ID = "100000000000000001"
+APPLICATION_ID = BOT_ID
+BOT_USER = {"id": BOT_ID, "username": "FakeBibleBot", "discriminator": "0",
+            "global_name": None, "avatar": None, "bot": True, "flags": 0}
+OWNER = {"id": "100000000000000002", "username": "owner", "discriminator": "0",
+         "global_name": None, "avatar": None, "flags": 0}
+
+# Snowflakes whose timestamp bits put guild i on shard i % shard_count
+GUILD_IDS = [str((i << 22) | 1) for i in range(GUILD_COUNT)]
+
+identified = {}  # {shard_id: session_id}, for the summary log
+
+
+def guild_payload(guild_id, index):
+    return {
+        "id": guild_id, "name": f"Fake Guild {index}", "icon": None, "owner_id": OWNER["id"],
+        "unavailable": False, "member_count": 1, "large": False, "features": [],
+        "roles": [{"id": guild_id, "name": "@everyone", "permissions": "0", "position": 0,
+                   "color": 0, "hoist": False, "managed": False, "mentionable": False}],
+        "emojis": [], "stickers": [], "channels": [], "threads": [], "members": [],
+        "voice_states": [], "presences": [], "stage_instances": [],
+        "guild_scheduled_events": [], "soundboard_sounds": [],
+        "verification_level": 0, "default_message_notifications": 0,
+        "explicit_content_filter": 0, "mfa_level": 0, "nsfw_level": 0,
+        "premium_tier": 0, "preferred_locale": "en-US", "joined_at": "2024-01-01T00:00:00+00:00",
+    }
+
+
+# === REST ===
+def json_response(data, status=200):
+    # discord.py only decodes bodies whose Content-Type is exactly application/json (no charset)
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={"Content-Type": "application/json"})
+
+
+async def users_me(request):
+    return json_response(BOT_USER)
+
+
+async def application_me(request):
+    return json_response({
+        "id": APPLICATION_ID, "name": "FakeBibleBot", "icon": None, "description": "",
+        "bot_public": True, "bot_require_code_grant": False, "owner": OWNER, "team": None,
+        "verify_key": "0" * 64, "flags": 0, "summary": "", "bot": BOT_USER,
+        "interactions_endpoint_url": None, "redirect_uris": [], "tags": [],
+    })
+
+
+async def gateway_bot(request):
+    return json_response({
+        "url": f"ws://{request.host}/gateway",
+        "shards": 1,
+        "session_start_limit": {"total": 1000, "remaining": 1000,
+                                "reset_after": 0, "max_concurrency": 16},
+    })
+
+
+async def sync_commands(request):
+    commands = await request.json()
+    for i, command in enumerate(commands, 1):
+        command.update(id=str(200000000000000000 + i), application_id=APPLICATION_ID, version="1")
+    return json_response(commands)
+
+
+async def not_found(request):
+    print(f"❔ Unhandled {request.method} {request.path}")
+    return json_response({"message": "Unknown route (fake gateway)", "code": 0}, status=404)
+
+
+# === GATEWAY ===
+async def gateway(request):
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    await ws.send_str(json.dumps({"op": 10, "d": {"heartbeat_interval": HEARTBEAT_INTERVAL_MS},
+                                  "s": None, "t": None}))
+    seq = 0
+
+    async def dispatch(event, data):
+        nonlocal seq
+        seq += 1
+        await ws.send_str(json.dumps({"op": 0, "t": event, "s": seq, "d": data}))
+
+    async for msg in ws:
+        if msg.type != WSMsgType.TEXT:
+            break
+        payload = json.loads(msg.data)
+        op = payload.get("op")
+        if op == 1:
+            # discord.py times the ack from when its keep-alive thread finishes sending;
+            # an instant local reply can beat that bookkeeping and look 41 s late
+            await asyncio.sleep(0.05)
+            await ws.send_str(json.dumps({"op": 11, "d": None, "s": None, "t": None}))
+        elif op == 2:
+            shard_id, shard_count = payload["d"].get("shard") or (0, 1)
+            session_id = f"fake-{shard_id}-{int(time.time() * 1000)}"
+            mine = [(i, gid) for i, gid in enumerate(GUILD_IDS) if (int(gid) >> 22) % shard_count == shard_id]
+            identified[shard_id] = session_id
+            print(f"🔗 Shard {shard_id}/{shard_count} identified, {len(mine)} guild(s); "
+                  f"{len(identified)} shard(s) seen so far")
+            await dispatch("READY", {
+                "v": 10, "user": BOT_USER, "session_id": session_id,
+                "resume_gateway_url": f"ws://{request.host}/gateway",
+                "shard": [shard_id, shard_count],
+                "guilds": [{"id": gid, "unavailable": True} for _, gid in mine],
+                "application": {"id": APPLICATION_ID, "flags": 0},
+                "private_channels": [], "relationships": [],
+            })
+            for i, gid in mine:
+                await dispatch("GUILD_CREATE", guild_payload(gid, i))
+        elif op == 6:
+            await dispatch("RESUMED", {})
+    return ws
+
+
+def make_app():
+    app = web.Application()
+    app.router.add_get("/api/v10/users/@me", users_me)
+    app.router.add_get("/api/v10/oauth2/applications/@me", application_me)
+    app.router.add_get("/api/v10/gateway/bot", gateway_bot)
+    app.router.add_put(r"/api/v10/applications/{app_id}/commands", sync_commands)
+    app.router.add_get("/gateway", gateway)
+    app.router.add_route("*", "/{tail:.*}", not_found)
+    return app
+
+
+if __name__ == "__main__":
+    print(f"🧪 Fake Discord on http://{HOST}:{PORT} with {GUILD_COUNT} guild(s)")
+    web.run_app(make_app(), host=HOST, port=PORT, print=None)
@@ -0,0 +1,109 @@
+"""
+Runs bot.py as several worker processes, each owning a contiguous range of shards, and
+restarts any worker that dies. Every worker is a normal bot.py with its own event loop,
+FFmpeg children, playback state and manifest snapshot, so voice work spreads over all cores.
+
+Environment (everything else is passed through to the workers):
+    WORKERS      number of worker processes (default: CPU count)
+    SHARD_COUNT  total shards across all workers (default: WORKERS)
+    METRICS_PORT if set, worker i serves its metrics on METRICS_PORT + i
+"""
+import os
+import signal
+import subprocess
+import sys
+import time
+
+BOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+WORKERS = int(os.getenv("WORKERS", str(os.cpu_count() or 1)))
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or WORKERS
+RESTART_BACKOFF_MAX = 60  # Seconds between restarts of a worker that keeps crashing
+STABLE_SECONDS = 120      # A worker that ran this long starts its backoff over
+STOP_GRACE_SECONDS = 15
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+
+def shard_ranges(shard_count, workers):
+    """Split shard ids 0..shard_count-1 into `workers` contiguous, near-equal ranges"""
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+    ranges = []
+    start = 0
+    for i in range(workers):
+        size = base + (1 if i < extra else 0)
+        ranges.append((start, start + size - 1))
+        start += size
+    return ranges
+
+
+class Worker:
+    def __init__(self, index, first_shard, last_shard):
+        self.index = index
+        self.shards = f"{first_shard}-{last_shard}"
+        self.process = None
+        self.started_at = 0.0
+        self.failures = 0
+        self.restart_at = 0.0
+
+    def start(self):
+        env = dict(os.environ, SHARD_COUNT=str(SHARD_COUNT), SHARD_IDS=self.shards)
+        if METRICS_PORT:
+            env["METRICS_PORT"] = str(METRICS_PORT + self.index)
+        self.process = subprocess.Popen([sys.executable, BOT_PATH], env=env)
+        self.started_at = time.monotonic()
+        print(f"🚀 Worker {self.index} (shards {self.shards}) started, pid {self.process.pid}")
+
+    def check(self, now):
+        """Restart the worker if it has exited and its backoff has passed"""
+        if self.process is not None:
+            code = self.process.poll()
+            if code is None:
+                return
+            ran = now - self.started_at
+            self.failures = 0 if ran >= STABLE_SECONDS else self.failures + 1
+            delay = min(RESTART_BACKOFF_MAX, 2 ** self.failures) if self.failures else 1
+            print(f"💥 Worker {self.index} (shards {self.shards}) exited with {code} after {ran:.0f}s, "
+                  f"restarting in {delay}s")
+            self.process = None
+            self.restart_at = now + delay
+        if now >= self.restart_at:
+            self.start()
+
+
+def main():
+    workers = [Worker(i, first, last) for i, (first, last) in enumerate(shard_ranges(SHARD_COUNT, WORKERS))]
+    print(f"🧭 Supervising {len(workers)} worker(s) for {SHARD_COUNT} shard(s)")
+
+    stopping = False
+
+    def request_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    for worker in workers:
+        worker.start()
+    while not stopping:
+        time.sleep(1)
+        now = time.monotonic()
+        for worker in workers:
+            if not stopping:
+                worker.check(now)
+
+    print("🛑 Stopping workers...")
+    running = [w.process for w in workers if w.process is not None and w.process.poll() is None]
+    for process in running:
+        process.send_signal(signal.SIGTERM)
+    deadline = time.monotonic() + STOP_GRACE_SECONDS
+    for process in running:
+        try:
+            process.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+if __name__ == "__main__":
+    main()